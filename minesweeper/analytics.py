@@ -2,158 +2,537 @@
 analytics.py — generate analytics plots for Minesweeper configurations.
 
 Called from the GUI ("Run Analytics...") to produce a SINGLE window
-with 4 subplots (2x2 layout):
+with 5 subplots:
 - White cells histogram
 - Number distribution
-- Mine cluster distribution
 - 3x3 neighborhood heatmap
+- Mine cluster distribution
+- Mine cluster size distribution
+
+It can also run headless (no tkinter, no display) from the `minesweeper`
+directory, writing the statistics to JSON/NPZ and the figure to PNG:
+
+    python -m analytics --difficulty expert --count 100000 --seed 1 \
+        --workers 8 --json expert.json --npz expert.npz --png expert.png
 """
 
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+
 import numpy as np
-import matplotlib.pyplot as plt
 
 # This assumes you are inside the `minesweeper` package.
 # If this file sits next to game.py and __init__.py, this is correct:
+from config import EASY, INTERMEDIATE, EXPERT
 from game import MinesweeperGame
+from npboard import neighbor_counts
+import solver
 
 MINE = MinesweeperGame.MINE  # e.g. -1
 
+# Upper bound on the random keys generated at once by gen_boards_array (float64 count).
+_BATCH_CELLS = 4_000_000
+
+# Boards per task in compute_stats; fixed so results do not depend on the worker count.
+CHUNK_BOARDS = 2048
+
 
 def gen_boards(rows, cols, mines, n=20, seed=None):
     """
     Generate `n` random boards using the game's safe-first-click logic.
 
+    One `random.Random(seed)` drives both the first clicks and every board's
+    mine placement, so the same seed always yields the same boards.
+
     Returns:
         boards: list of 2D lists (board[r][c] is either MINE or 0–8).
     """
-    rng = np.random.default_rng(seed)
+    rng = random.Random(seed)
     boards = []
 
     for _ in range(n):
-        g = MinesweeperGame(rows, cols, mines, safe_first_click=True)
-        r = int(rng.integers(0, rows))
-        c = int(rng.integers(0, cols))
+        g = MinesweeperGame(rows, cols, mines, safe_first_click=True, rng=rng)
+        r = rng.randrange(rows)
+        c = rng.randrange(cols)
         g.reveal(r, c)  # triggers mine placement and some reveals
         boards.append([row[:] for row in g.board])
 
     return boards
 
 
+def gen_boards_array(rows, cols, mines, n=20, seed=None, return_clicks=False):
+    """
+    Vectorized equivalent of `gen_boards`: generate `n` boards at once.
+
+    Each board gets a uniformly random first click that is excluded from the
+    mines (safe-first-click), then `mines` positions drawn uniformly from the
+    remaining cells by taking the smallest random keys per board.
+
+    Returns:
+        boards: int8 array of shape (n, rows, cols) holding MINE or 0–8.
+        clicks: (only with return_clicks) (n,) flat index of each first click.
+    """
+    rng = np.random.default_rng(seed)
+    area = rows * cols
+    out = np.empty((n, rows, cols), dtype=np.int8)
+    clicks = np.empty(n, dtype=np.int64)
+    step = max(1, _BATCH_CELLS // area)
+
+    for start in range(0, n, step):
+        k = min(step, n - start)
+        keys = rng.random((k, area))
+        first = rng.integers(0, area, size=k)
+        clicks[start:start + k] = first
+        keys[np.arange(k), first] = 2.0  # first click: never among the smallest
+        picks = np.argpartition(keys, mines - 1, axis=1)[:, :mines]
+        mine = np.zeros((k, area), dtype=bool)
+        np.put_along_axis(mine, picks, True, axis=1)
+        mine = mine.reshape(k, rows, cols)
+        batch = neighbor_counts(mine).astype(np.int8)
+        batch[mine] = MINE
+        out[start:start + k] = batch
+
+    return (out, clicks) if return_clicks else out
+
+
+# (this, next) slices covering every 8-neighbor pair once: right, down, down-right, down-left
+_NEIGHBOR_PAIRS = [
+    ((..., slice(None), slice(None, -1)), (..., slice(None), slice(1, None))),
+    ((..., slice(None, -1), slice(None)), (..., slice(1, None), slice(None))),
+    ((..., slice(None, -1), slice(None, -1)), (..., slice(1, None), slice(1, None))),
+    ((..., slice(None, -1), slice(1, None)), (..., slice(1, None), slice(None, -1))),
+]
+
+
+def _union_find(masks):
+    """
+    Vectorized union-find over the mines of a boolean mask (any leading dims).
+
+    Mines are numbered in flat order and every adjacent mine pair is an edge.
+    Each pass hooks the larger root of every unresolved edge onto the smaller
+    one (np.minimum.at) and then compresses paths fully, so every cluster ends
+    up pointing at its lowest-numbered mine.
+
+    Returns:
+        flat:   flat indices of the mines
+        parent: for each mine, the number of its cluster's root mine
+    """
+    node = np.full(masks.shape, -1, dtype=np.int64)
+    flat = np.flatnonzero(masks)
+    node.ravel()[flat] = np.arange(flat.size)
+    us, vs = [], []
+    for a, b in _NEIGHBOR_PAIRS:
+        both = masks[a] & masks[b]
+        us.append(node[a][both])
+        vs.append(node[b][both])
+    u, v = np.concatenate(us), np.concatenate(vs)
+
+    parent = np.arange(flat.size, dtype=np.int64)
+    while u.size:
+        pu, pv = parent[u], parent[v]
+        open_ = pu != pv
+        u, v, pu, pv = u[open_], v[open_], pu[open_], pv[open_]
+        np.minimum.at(parent, np.maximum(pu, pv), np.minimum(pu, pv))
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+    return flat, parent
+
+
+def label_clusters(mine_masks):
+    """
+    Label 8-connected mine clusters in one (rows, cols) mask or a whole
+    (n, rows, cols) batch of masks at once.
+
+    Returns:
+        int64 array shaped like the input: -1 for non-mines, otherwise the
+        flat index (into the whole batch) of the cluster's first cell.
+    """
+    masks = np.asarray(mine_masks, dtype=bool)
+    flat, parent = _union_find(masks)
+    labels = np.full(masks.shape, -1, dtype=np.int64)
+    labels.ravel()[flat] = flat[parent]
+    return labels
+
+
+def cluster_stats(mine_masks):
+    """
+    Cluster counts and sizes for a (rows, cols) mask or (n, rows, cols) batch.
+
+    Returns:
+        counts: (n,) number of clusters per board
+        sizes:  1-D array with the size of every cluster in the batch
+    """
+    masks = np.asarray(mine_masks, dtype=bool)
+    rows, cols = masks.shape[-2:]
+    n = masks.size // (rows * cols)
+    flat, parent = _union_find(masks)
+    roots = parent == np.arange(parent.size)
+    counts = np.bincount(flat[roots] // (rows * cols), minlength=n)
+    sizes = np.bincount(parent, minlength=parent.size)[roots]
+    return counts, sizes
+
+
 def _clusters_single(board):
     """
     Count the number of mine clusters in a single board.
     Mines connected horizontally, vertically OR diagonally are in the same cluster.
     """
-    rows = len(board)
-    cols = len(board[0])
-    visited = set()
-    clusters = 0
-
-    for r in range(rows):
-        for c in range(cols):
-            if board[r][c] == MINE and (r, c) not in visited:
-                clusters += 1
-                stack = [(r, c)]
-                visited.add((r, c))
-                while stack:
-                    rr, cc = stack.pop()
-                    for dr in (-1, 0, 1):
-                        for dc in (-1, 0, 1):
-                            if dr == 0 and dc == 0:
-                                continue
-                            nr, nc = rr + dr, cc + dc
-                            if (
-                                0 <= nr < rows
-                                and 0 <= nc < cols
-                                and board[nr][nc] == MINE
-                                and (nr, nc) not in visited
-                            ):
-                                visited.add((nr, nc))
-                                stack.append((nr, nc))
-    return clusters
+    counts, _ = cluster_stats(np.asarray(board) == MINE)
+    return int(counts[0])
 
 
-def show_all_plots(boards):
+def _add_hist(a, b):
+    """Sum two bincount-style histograms of possibly different lengths."""
+    if len(a) < len(b):
+        a, b = b, a
+    out = a.copy()
+    out[:len(b)] += b
+    return out
+
+
+class BoardStats:
     """
-    Show ALL four analytics plots together in a single figure (2x2):
+    Streaming accumulator for the analytics figure.
+
+    Boards are fed in with `add` (one board or a batch at a time) and only
+    fixed-size summaries are kept, so memory does not grow with the number of
+    boards:
 
-    - Top-left: white cells histogram
-    - Top-right: number distribution
-    - Bottom-left: cluster distribution
-    - Bottom-right: avg 3×3 neighborhood mines heatmap
+    - n:             number of boards seen
+    - value_counts:  (10,) occurrences of each value M, 0–8
+    - white_hist:    boards per number of zero cells (index = count)
+    - cluster_hist:  boards per number of mine clusters (index = count)
+    - cluster_sizes: clusters per cluster size (index = size)
+    - heat_sum:      (rows, cols) mines in each cell's 3×3 neighborhood, summed over boards
     """
-    if not boards:
+
+    def __init__(self, rows, cols):
+        self.rows, self.cols = rows, cols
+        self.n = 0
+        self.value_counts = np.zeros(10, dtype=np.int64)
+        self.white_hist = np.zeros(0, dtype=np.int64)
+        self.cluster_hist = np.zeros(0, dtype=np.int64)
+        self.cluster_sizes = np.zeros(0, dtype=np.int64)
+        self.heat_sum = np.zeros((rows, cols), dtype=np.int64)
+
+    def add(self, boards):
+        """Accumulate one board (rows, cols) or a batch (n, rows, cols); lists of lists work too."""
+        boards_arr = np.asarray(boards)
+        if boards_arr.ndim == 2:
+            boards_arr = boards_arr[None]
+        if len(boards_arr) == 0:
+            return self
+        mine_masks = boards_arr == MINE
+        cluster_counts, sizes = cluster_stats(mine_masks)
+        self.n += len(boards_arr)
+        self.value_counts += np.bincount((boards_arr.astype(np.int64) - MINE).ravel(), minlength=10)
+        self.white_hist = _add_hist(self.white_hist, np.bincount((boards_arr == 0).sum(axis=(1, 2))))
+        self.cluster_hist = _add_hist(self.cluster_hist, np.bincount(cluster_counts))
+        self.cluster_sizes = _add_hist(self.cluster_sizes, np.bincount(sizes))
+        self.heat_sum += (neighbor_counts(mine_masks) + mine_masks).sum(axis=0, dtype=np.int64)
+        return self
+
+    def summary(self):
+        """JSON-ready dict of the accumulated statistics."""
+        white = np.arange(len(self.white_hist))
+        clusters = np.arange(len(self.cluster_hist))
+        return {
+            "rows": self.rows,
+            "cols": self.cols,
+            "n": self.n,
+            "mean_white_cells": float(white @ self.white_hist / self.n) if self.n else None,
+            "mean_clusters": float(clusters @ self.cluster_hist / self.n) if self.n else None,
+            "value_counts": dict(zip(["M"] + [str(v) for v in range(9)], self.value_counts.tolist())),
+            "white_hist": self.white_hist.tolist(),
+            "cluster_hist": self.cluster_hist.tolist(),
+            "cluster_sizes": self.cluster_sizes.tolist(),
+        }
+
+    def save_npz(self, path):
+        np.savez_compressed(
+            path,
+            n=self.n,
+            value_counts=self.value_counts,
+            white_hist=self.white_hist,
+            cluster_hist=self.cluster_hist,
+            cluster_sizes=self.cluster_sizes,
+            heat_sum=self.heat_sum,
+        )
+
+    def merge(self, other):
+        """Fold another accumulator for the same board size into this one."""
+        self.n += other.n
+        self.value_counts += other.value_counts
+        self.white_hist = _add_hist(self.white_hist, other.white_hist)
+        self.cluster_hist = _add_hist(self.cluster_hist, other.cluster_hist)
+        self.cluster_sizes = _add_hist(self.cluster_sizes, other.cluster_sizes)
+        self.heat_sum += other.heat_sum
+        return self
+
+
+def _chunk_stats(rows, cols, mines, n, seed_seq):
+    """Worker task: generate one chunk of boards and reduce it to a `BoardStats`."""
+    return BoardStats(rows, cols).add(gen_boards_array(rows, cols, mines, n, seed=seed_seq))
+
+
+class Cancelled(Exception):
+    """Raised by `compute_stats` when its `cancel` event is set."""
+
+
+def _run_chunks(task, rows, cols, mines, n, seed, chunk, workers, cancel, mp_context):
+    """
+    Run `task(rows, cols, mines, k, seed_seq)` over fixed chunks of `n` boards
+    and yield the results in chunk order.
+
+    Chunk seeds are spawned from one master `np.random.SeedSequence(seed)` and
+    chunking does not depend on `workers`, so the results are identical for
+    any worker count. With workers > 1 the chunks run in a process pool.
+    """
+    sizes = [min(chunk, n - start) for start in range(0, n, chunk)]
+    seqs = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(rows, cols, mines, k, sq) for k, sq in zip(sizes, seqs)]
+
+    if workers <= 1 or len(args) <= 1:
+        for a in args:
+            if cancel is not None and cancel.is_set():
+                raise Cancelled()
+            yield task(*a)
         return
 
-    boards_arr = np.array(boards)
-    n, rows, cols = boards_arr.shape
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context)
+    try:
+        futures = [pool.submit(task, *a) for a in args]
+        for fut in futures:  # yield in submission order
+            while True:
+                if cancel is not None and cancel.is_set():
+                    raise Cancelled()
+                try:
+                    part = fut.result(timeout=0.1)
+                    break
+                except FuturesTimeout:
+                    pass
+            yield part
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
-    # --- Data for white cell counts ---
-    white_counts = [
-        sum(1 for row in b for v in row if v == 0)
-        for b in boards
-    ]
 
-    # --- Data for number distribution ---
-    values = [v for b in boards for row in b for v in row]
+def compute_stats(rows, cols, mines, n, seed=None, workers=1, chunk=CHUNK_BOARDS,
+                  progress=None, cancel=None, mp_context=None):
+    """
+    Generate `n` boards and accumulate them into a `BoardStats`, optionally
+    across a process pool.
+
+    The work is cut into fixed chunks of `chunk` boards (see `_run_chunks`),
+    so the result is identical for any worker count. Only one chunk of boards
+    per worker exists at a time, and workers send back just their chunk's
+    accumulator.
+
+    `progress(done)` is called with the number of boards finished after each
+    chunk. If `cancel` (e.g. a `threading.Event`) gets set, pending chunks are
+    dropped and `Cancelled` is raised. `mp_context` is passed to the pool,
+    e.g. a "spawn" context when calling from a GUI thread.
+    """
+    stats = BoardStats(rows, cols)
+    for part in _run_chunks(_chunk_stats, rows, cols, mines, n, seed, chunk, workers, cancel, mp_context):
+        stats.merge(part)
+        if progress: progress(stats.n)
+    return stats
 
-    # --- Data for cluster counts ---
-    cluster_counts = [_clusters_single(b) for b in boards]
 
-    # --- Data for heatmap: avg mines in 3×3 neighborhood ---
-    mine_masks = (boards_arr == MINE).astype(int)
-    heat_accum = np.zeros((rows, cols), dtype=float)
+def _chunk_solvability(rows, cols, mines, n, seed_seq):
+    """Worker task: generate one chunk of boards and play each from its first click."""
+    boards, clicks = gen_boards_array(rows, cols, mines, n, seed=seed_seq, return_clicks=True)
+    safe = rows * cols - mines
+    fractions = np.array([solver.solve_layout(b.ravel().tolist(), rows, cols, mines, int(c))
+                          for b, c in zip(boards, clicks)]) / safe
+    return {
+        "n": n,
+        "solved": int(np.count_nonzero(fractions == 1.0)),
+        "fraction_sum": float(fractions.sum()),
+        "fraction_hist": np.bincount(np.minimum((fractions * 20).astype(int), 20), minlength=21),
+    }
 
-    for b in mine_masks:
-        padded = np.pad(b, 1, mode="constant")
-        local = np.zeros_like(b)
-        for dr in range(3):
-            for dc in range(3):
-                local += padded[dr:dr + rows, dc:dc + cols]
-        heat_accum += local
 
-    avg_heat = heat_accum / n
+def solvability_stats(rows, cols, mines, n, seed=None, workers=1, chunk=CHUNK_BOARDS, cancel=None, mp_context=None):
+    """
+    How much of a random board the deduction solver clears from the first
+    click without guessing.
+
+    Returns a dict with n, solved (boards cleared completely), mean_fraction
+    (average share of safe cells revealed) and fraction_hist (boards per 5%
+    bucket of revealed share, last bucket = fully solved).
+    """
+    total = {"n": 0, "solved": 0, "fraction_sum": 0.0, "fraction_hist": np.zeros(21, dtype=np.int64)}
+    for part in _run_chunks(_chunk_solvability, rows, cols, mines, n, seed, chunk, workers, cancel, mp_context):
+        for k in total:
+            total[k] += part[k]
+    return {
+        "n": total["n"],
+        "solved": total["solved"],
+        "mean_fraction": total["fraction_sum"] / total["n"] if total["n"] else None,
+        "fraction_hist": total["fraction_hist"].tolist(),
+    }
 
-    # --- Single figure with 4 subplots ---
-    fig, axs = plt.subplots(2, 2, figsize=(12, 8))
+
+def _hist_from_counts(ax, hist, bins, **kwargs):
+    """`ax.hist` over data given as a bincount-style histogram (index = value)."""
+    values = np.flatnonzero(hist)
+    if values.size:
+        ax.hist(values, bins=bins, weights=hist[values], **kwargs)
+
+
+def show_all_plots(boards):
+    """
+    Show ALL five analytics plots together in a single figure:
+
+    - Top row: white cells histogram, number distribution, avg 3×3 neighborhood mines heatmap
+    - Bottom row: clusters per board, cluster size distribution
+    """
+    if len(boards) == 0:
+        return
+    boards_arr = np.asarray(boards)
+    show_stats(BoardStats(*boards_arr.shape[1:]).add(boards_arr))
+
+
+def show_stats(stats, png=None):
+    """
+    Plot the figure described in `show_all_plots` from a `BoardStats` accumulator.
+
+    With `png`, the figure is rendered off-screen (no GUI backend involved)
+    and saved to that path instead of being shown.
+    """
+    if stats.n == 0:
+        return
+    if png is not None:
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(16, 9))
+        _draw_stats(fig, stats)
+        fig.savefig(png)
+        return
+    import matplotlib.pyplot as plt  # deferred: pulls in a GUI backend
+    fig = plt.figure(figsize=(16, 9))
+    _draw_stats(fig, stats)
+    plt.show()
+
+
+def _draw_stats(fig, stats):
+    avg_heat = stats.heat_sum / stats.n
+
+    # --- Single figure: 3 plots on top, 2 below ---
+    gs = fig.add_gridspec(2, 6)
 
     # 1) White cells histogram
-    ax = axs[0, 0]
-    ax.hist(white_counts, bins=20, edgecolor="black")
+    ax = fig.add_subplot(gs[0, 0:2])
+    _hist_from_counts(ax, stats.white_hist, bins=20, edgecolor="black")
     ax.set_title("White Cells per Board")
     ax.set_xlabel("Number of white cells")
     ax.set_ylabel("Frequency")
 
     # 2) Number distribution
-    ax = axs[0, 1]
-    ax.hist(values, bins=np.arange(-1.5, 9.5, 1), edgecolor="black")
+    ax = fig.add_subplot(gs[0, 2:4])
+    ax.bar(range(-1, 9), stats.value_counts, width=1.0, edgecolor="black")
     ax.set_xticks(range(-1, 9))
     ax.set_xticklabels(["M"] + list(range(0, 9)))
     ax.set_title("Distribution of Cell Values")
     ax.set_xlabel("Cell value (M, 0–8)")
     ax.set_ylabel("Count")
 
-    # 3) Cluster distribution
-    ax = axs[1, 0]
-    if cluster_counts:
-        ax.hist(
-            cluster_counts,
-            bins=range(0, max(cluster_counts) + 2),
-            edgecolor="black",
-            align="left",
-        )
-    ax.set_title("Mine Clusters per Board")
-    ax.set_xlabel("Number of clusters")
-    ax.set_ylabel("Frequency")
-
-    # 4) Heatmap
-    ax = axs[1, 1]
+    # 3) Heatmap
+    ax = fig.add_subplot(gs[0, 4:6])
     im = ax.imshow(avg_heat, cmap="hot", interpolation="nearest")
     ax.set_title("Avg Mines in 3×3 Neighborhood")
     ax.set_xlabel("Column index")
     ax.set_ylabel("Row index")
     fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04, label="Avg mines in 3×3")
 
+    # 4) Cluster distribution
+    ax = fig.add_subplot(gs[1, 0:3])
+    _hist_from_counts(
+        ax,
+        stats.cluster_hist,
+        bins=range(0, len(stats.cluster_hist) + 1),
+        edgecolor="black",
+        align="left",
+    )
+    ax.set_title("Mine Clusters per Board")
+    ax.set_xlabel("Number of clusters")
+    ax.set_ylabel("Frequency")
+
+    # 5) Cluster sizes
+    ax = fig.add_subplot(gs[1, 3:6])
+    ax.bar(range(len(stats.cluster_sizes)), stats.cluster_sizes, width=1.0, edgecolor="black")
+    ax.set_yscale("log")
+    ax.set_title("Mine Cluster Sizes")
+    ax.set_xlabel("Mines in cluster")
+    ax.set_ylabel("Clusters (log scale)")
+
     fig.suptitle("Minesweeper Board Analytics", fontsize=16)
-    plt.tight_layout(rect=[0, 0, 1, 0.96])
-    plt.show()
+    fig.tight_layout(rect=[0, 0, 1, 0.96])
+
+
+DIFFICULTIES = {"easy": EASY, "intermediate": INTERMEDIATE, "expert": EXPERT}
+
+
+def main(argv=None):
+    """Headless entry point; see the module docstring for an example."""
+    p = argparse.ArgumentParser(prog="python -m analytics", description="Headless Minesweeper board analytics.")
+    p.add_argument("--difficulty", choices=sorted(DIFFICULTIES), help="preset board size (overridden by --rows/--cols/--mines)")
+    p.add_argument("--rows", type=int)
+    p.add_argument("--cols", type=int)
+    p.add_argument("--mines", type=int)
+    p.add_argument("--count", type=int, default=1000, help="number of boards (default: 1000)")
+    p.add_argument("--seed", type=int, help="master seed; the same seed gives the same results for any --workers")
+    p.add_argument("--workers", type=int, default=1, help="worker processes (default: 1)")
+    p.add_argument("--json", metavar="PATH", help="write summary statistics as JSON ('-' for stdout)")
+    p.add_argument("--npz", metavar="PATH", help="write the raw accumulator arrays as .npz")
+    p.add_argument("--png", metavar="PATH", help="render the analytics figure to a PNG file")
+    p.add_argument("--solve", action="store_true",
+                   help="also measure how much of each board the deduction solver clears without guessing")
+    args = p.parse_args(argv)
+
+    diff = DIFFICULTIES[args.difficulty] if args.difficulty else None
+    rows = args.rows or (diff and diff.rows)
+    cols = args.cols or (diff and diff.cols)
+    mines = args.mines or (diff and diff.mines)
+    if not (rows and cols and mines):
+        p.error("give --difficulty or all of --rows/--cols/--mines")
+    if not 0 < mines < rows * cols:
+        p.error(f"--mines must be between 1 and {rows * cols - 1}")
+    if args.count < 1:
+        p.error("--count must be positive")
+
+    started = time.perf_counter()
+    stats = compute_stats(rows, cols, mines, args.count, seed=args.seed, workers=args.workers)
+    elapsed = time.perf_counter() - started
+
+    summary = {"mines": mines, "seed": args.seed, "workers": args.workers, "seconds": round(elapsed, 3)}
+    summary.update(stats.summary())
+    if args.solve:
+        started = time.perf_counter()
+        summary["solvability"] = solvability_stats(rows, cols, mines, args.count, seed=args.seed, workers=args.workers)
+        summary["solvability"]["seconds"] = round(time.perf_counter() - started, 3)
+    if args.json == "-":
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    if args.npz:
+        stats.save_npz(args.npz)
+    if args.png:
+        show_stats(stats, png=args.png)
+    print(f"{stats.n} boards of {rows}x{cols}:{mines} in {elapsed:.2f}s "
+          f"(mean white cells {summary['mean_white_cells']:.2f}, mean clusters {summary['mean_clusters']:.2f})",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""
+bench.py — headless benchmark suite for the engines, the game model,
+analytics and the high score stores.
+
+Every benchmark times one operation with garbage collection off, running it
+at least `--repeat` times and for at least `--min-time` seconds after one
+discarded warm-up run (imports, caches); setup (fresh boards, prepared
+batches, score files) is not timed. Results go to
+stdout as JSON, keyed by names such as `board.reveal_worst_cold[list,expert]`:
+
+- board.construct / board.place_mines: make_board and the first-click mine placement
+- board.reveal_worst_cold / board.reveal_worst_warm: a click that opens the
+  whole board (every mine packed into the last cells), the largest flood fill
+  a board of that size can have. The cold case is a real first click: mine
+  placement and the zero-region index it builds are timed with the reveal.
+  The warm case places the mines in setup and times the reveal alone
+- game.clear: Game.click on every safe cell in random order (logging, undo
+  history and win checks included)
+- analytics.gen_boards / analytics.clusters_single / analytics.board_stats:
+  board generation, single-board cluster count, and the BoardStats
+  accumulator (value counts, clusters, 3x3 heatmap) over a batch
+- analytics.heatmap_png: the analytics figure rendered off-screen
+  (skipped when matplotlib is missing)
+- highscores.submit: submit_score against a JSON or SQLite store that
+  already holds N results for the configuration
+- gui.restart: MinesweeperWindow._new_game on Expert and 60x60, reusing the
+  tile grid (what New Game does) and rebuilding it (what it did before grid
+  reuse), layout included (skipped without a display)
+
+Save a run and compare later runs against it; benchmarks whose median got
+slower than `--tolerance` are listed under "regressions" and the exit status
+is 1:
+
+    python -m bench > baseline.json
+    python -m bench --baseline baseline.json --sizes expert 60x60
+
+A reference run is committed as bench_baseline.json next to this file, and a
+bare `--baseline` compares against it. Its header records the machine it came
+from; times only compare on similar hardware, so regenerate it on yours
+(`python -m bench > bench_baseline.json`) before relying on the regressions.
+"""
+
+from __future__ import annotations
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import closing
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from config import Difficulty, EASY, INTERMEDIATE, EXPERT
+from board import make_board
+from game import Game
+
+SIZES = {
+    "easy": EASY,
+    "intermediate": INTERMEDIATE,
+    "expert": EXPERT,
+    "60x60": Difficulty(60, 60, 720),          # Expert density on larger boards
+    "300x300": Difficulty(300, 300, 18000),
+}
+SCORES = (10_000, 100_000)
+GUI_SIZES = ("expert", "60x60")   # restart benchmarks; the tile renderer stops at 60x60
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+
+def _time(op: Callable, setup: Callable | None = None, repeat: int = 5, min_time: float = 0.2) -> List[float]:
+    """
+    Seconds per run of `op(setup())`; at least `repeat` runs and `min_time`
+    seconds of them, after one untimed warm-up run.
+    """
+    times = []
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        op(setup() if setup else None)  # first-call costs (imports, caches) stay out of the samples
+        while len(times) < repeat or (sum(times) < min_time and len(times) < 10_000):
+            arg = setup() if setup else None
+            t0 = time.perf_counter()
+            op(arg)
+            times.append(time.perf_counter() - t0)
+    finally:
+        if enabled: gc.enable()
+    return times
+
+
+def _summary(times: List[float], **extra) -> dict:
+    ordered = sorted(times)
+    return {"median_ms": round(statistics.median(times) * 1000, 4),
+            "p90_ms": round(ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))] * 1000, 4),
+            "runs": len(times), **extra}
+
+
+def _corner(rows: int, cols: int, mines: int, rng, start: int) -> List[int]:
+    """Layout hook that packs every mine into the last cells, so a click at (0, 0) opens all the rest."""
+    return list(range(rows * cols - mines, rows * cols))
+
+
+def _board_benchmarks(size: str, engine: str, seed: int, repeat: int, min_time: float) -> Iterator[Tuple[str, Callable]]:
+    d = SIZES[size]
+    tag = f"[{engine},{size}]"
+
+    def construct():
+        return _summary(_time(lambda _: make_board(d.rows, d.cols, d.mines, engine=engine, rng=seed),
+                              repeat=repeat, min_time=min_time))
+
+    def place_mines():
+        fresh = lambda: make_board(d.rows, d.cols, d.mines, engine=engine, rng=seed)
+        return _summary(_time(lambda b: b._place_mines({(d.rows // 2, d.cols // 2)}), fresh,
+                              repeat=repeat, min_time=min_time))
+
+    def reveal_worst(cold: bool):
+        def fresh():
+            b = make_board(d.rows, d.cols, d.mines, engine=engine, rng=seed, generator=_corner)
+            if not cold: b.first_click_place(0, 0)
+            return b
+        opened = []
+        def click(b):
+            if cold: b.first_click_place(0, 0)
+            b.reveal(0, 0)
+            opened.append(len(b.last_opened))
+        return _summary(_time(click, fresh, repeat=repeat, min_time=min_time), opened=opened[-1])
+
+    def clear():
+        def fresh():
+            g = Game(make_board(d.rows, d.cols, d.mines, engine=engine, rng=seed))
+            g.click(d.rows // 2, d.cols // 2)  # places the mines
+            safe = [(r, c) for r in range(d.rows) for c in range(d.cols) if not g.board.grid[r][c].mine]
+            random.Random(seed).shuffle(safe)
+            return g, safe
+        def play(arg):
+            g, safe = arg
+            for r, c in safe:
+                g.click(r, c)
+        return _summary(_time(play, fresh, repeat=repeat, min_time=min_time), clicks=d.rows * d.cols - d.mines)
+
+    yield "board.construct" + tag, construct
+    yield "board.place_mines" + tag, place_mines
+    yield "board.reveal_worst_cold" + tag, lambda: reveal_worst(True)
+    yield "board.reveal_worst_warm" + tag, lambda: reveal_worst(False)
+    yield "game.clear" + tag, clear
+
+
+def _analytics_benchmarks(size: str, seed: int, repeat: int, min_time: float) -> Iterator[Tuple[str, Callable]]:
+    import analytics  # numpy (and matplotlib for the figure) only for these
+    d = SIZES[size]
+    tag = f"[{size}]"
+    n = max(5, 50_000 // (d.rows * d.cols))  # boards per call, fewer on big boards
+
+    def gen_boards():
+        return _summary(_time(lambda _: analytics.gen_boards(d.rows, d.cols, d.mines, n, seed=seed),
+                              repeat=repeat, min_time=min_time), boards=n)
+
+    def clusters_single():
+        board = analytics.gen_boards(d.rows, d.cols, d.mines, 1, seed=seed)[0]
+        return _summary(_time(lambda _: analytics._clusters_single(board), repeat=repeat, min_time=min_time))
+
+    def board_stats():
+        boards = analytics.gen_boards_array(d.rows, d.cols, d.mines, n, seed=seed)
+        return _summary(_time(lambda _: analytics.BoardStats(d.rows, d.cols).add(boards),
+                              repeat=repeat, min_time=min_time), boards=n)
+
+    def heatmap_png():
+        try:
+            import matplotlib  # noqa: F401
+        except ImportError:
+            return {"skipped": "matplotlib is not installed"}
+        stats = analytics.BoardStats(d.rows, d.cols).add(analytics.gen_boards_array(d.rows, d.cols, d.mines, n, seed=seed))
+        with tempfile.TemporaryDirectory() as tmp:
+            png = os.path.join(tmp, "stats.png")
+            return _summary(_time(lambda _: analytics.show_stats(stats, png=png), repeat=repeat, min_time=min_time))
+
+    yield "analytics.gen_boards" + tag, gen_boards
+    yield "analytics.clusters_single" + tag, clusters_single
+    yield "analytics.board_stats" + tag, board_stats
+    yield "analytics.heatmap_png" + tag, heatmap_png
+
+
+def _score_benchmarks(stored: int, seed: int, repeat: int, min_time: float) -> Iterator[Tuple[str, Callable]]:
+    import highscores
+    d = EXPERT
+    key = highscores._key(d.rows, d.cols, d.mines)
+
+    def submit(kind):
+        rng = random.Random(seed)
+        times = sorted(rng.uniform(30, 999) for _ in range(stored))
+        with tempfile.TemporaryDirectory() as tmp:
+            if kind == "json":
+                path = os.path.join(tmp, "scores.json")
+                entries = [{"name": f"p{i}", "time": t, "when": "2024-01-01"} for i, t in enumerate(times)]
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump({key: entries}, f)
+                store = highscores.JsonStore(path)
+            else:
+                store = highscores.SqliteStore(os.path.join(tmp, "scores.sqlite3"), legacy_json=None)
+                with closing(sqlite3.connect(store.path)) as conn, conn:  # bulk load, not N submits
+                    conn.executemany("INSERT INTO scores (key, name, time, day) VALUES (?, ?, ?, '2024-01-01')",
+                                     [(key, f"p{i}", t) for i, t in enumerate(times)])
+                    conn.execute("INSERT OR REPLACE INTO counts (key, n) VALUES (?, ?)", (key, stored))
+            previous = highscores._backend
+            highscores.set_backend(store)
+            try:
+                return _summary(_time(lambda _: highscores.submit_score(d.rows, d.cols, d.mines, "bench",
+                                                                         rng.uniform(30, 999)),
+                                      repeat=repeat, min_time=min_time))
+            finally:
+                highscores.set_backend(previous)
+
+    for kind in ("json", "sqlite"):
+        yield f"highscores.submit[{kind},{stored}]", lambda kind=kind: submit(kind)
+
+
+def _gui_benchmarks(size: str, repeat: int, min_time: float) -> Iterator[Tuple[str, Callable]]:
+    d = SIZES[size]
+
+    def restart(renderer, reuse):
+        try:
+            import tkinter
+        except ImportError:
+            return {"skipped": "tkinter is not installed"}
+        try:
+            root = tkinter.Tk()
+        except tkinter.TclError as e:
+            return {"skipped": f"Tk unavailable: {e}"}
+        root.withdraw()
+        try:
+            import gui
+            win = gui.MinesweeperWindow(root, d.rows, d.cols, d.mines, theme="light", renderer=renderer)
+            win.withdraw()
+
+            def setup():
+                if not reuse: win._grid_shape = None  # forces _build_tiles, as every restart did before reuse
+
+            def op(_):
+                win._new_game()
+                win.update_idletasks()  # geometry and redraw are part of what the player waits for
+            return _summary(_time(op, setup, repeat=repeat, min_time=min_time))
+        finally:
+            root.destroy()
+
+    for renderer in ("tiles", "canvas"):
+        for reuse in (True, False):
+            yield (f"gui.restart[{renderer},{'reuse' if reuse else 'rebuild'},{size}]",
+                   lambda renderer=renderer, reuse=reuse: restart(renderer, reuse))
+
+
+def run(sizes=tuple(SIZES), engines=("list", "numpy"), scores=SCORES, only: str | None = None,
+        seed: int = 1, repeat: int = 5, min_time: float = 0.2, progress=None) -> Dict[str, dict]:
+    """Run the selected benchmarks; {name: {"median_ms", "p90_ms", "runs", ...}}."""
+    suites = []
+    for size in sizes:
+        for engine in engines:
+            suites.append(_board_benchmarks(size, engine, seed, repeat, min_time))
+        suites.append(_analytics_benchmarks(size, seed, repeat, min_time))
+        if size in GUI_SIZES:
+            suites.append(_gui_benchmarks(size, repeat, min_time))
+    for stored in scores:
+        suites.append(_score_benchmarks(stored, seed, repeat, min_time))
+
+    results = {}
+    for suite in suites:
+        for name, bench in suite:
+            if only and only not in name: continue
+            results[name] = bench()
+            if progress: progress(name, results[name])
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float = 0.25) -> List[dict]:
+    """
+    Benchmarks whose median is more than `tolerance` (0.25 = 25%) slower than
+    in `baseline`; names missing from either side are not compared.
+    """
+    slower = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if not base or "median_ms" not in base or "median_ms" not in res:
+            continue
+        ratio = res["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        if ratio > 1 + tolerance:
+            slower.append({"name": name, "baseline_ms": base["median_ms"], "median_ms": res["median_ms"],
+                           "ratio": round(ratio, 2)})
+    return slower
+
+
+def main(argv=None):
+    """Headless entry point; see the module docstring for examples."""
+    p = argparse.ArgumentParser(prog="python -m bench", description="Minesweeper benchmark suite.")
+    p.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    p.add_argument("--engines", nargs="+", choices=("list", "numpy"), default=["list", "numpy"])
+    p.add_argument("--scores", nargs="*", type=int, default=list(SCORES), metavar="N",
+                   help="stored results per high score store (default: %(default)s; none to skip)")
+    p.add_argument("--only", metavar="TEXT", help="run only benchmarks whose name contains TEXT")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--repeat", type=int, default=5, help="minimum runs per benchmark (default: 5)")
+    p.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per benchmark (default: 0.2)")
+    p.add_argument("--baseline", metavar="PATH", nargs="?", const=BASELINE,
+                   help="earlier output of this command to compare against (no PATH: the committed bench_baseline.json)")
+    p.add_argument("--tolerance", type=float, default=0.25,
+                   help="allowed slowdown of a median before it counts as a regression (default: 0.25)")
+    args = p.parse_args(argv)
+    if args.repeat < 1:
+        p.error("--repeat must be positive")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    def progress(name, res):
+        print(f"{name:48} {res.get('median_ms', '-'):>12} ms" if "median_ms" in res else f"{name:48} {res}",
+              file=sys.stderr)
+
+    started = time.perf_counter()
+    results = run(args.sizes, args.engines, args.scores, only=args.only, seed=args.seed,
+                  repeat=args.repeat, min_time=args.min_time, progress=progress)
+    out = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "when": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "seed": args.seed,
+        "seconds": round(time.perf_counter() - started, 3),
+        "results": results,
+    }
+    status = 0
+    if baseline is not None:
+        out["baseline"] = args.baseline
+        out["tolerance"] = args.tolerance
+        out["regressions"] = compare(results, baseline, args.tolerance)
+        for reg in out["regressions"]:
+            print(f"REGRESSION {reg['name']}: {reg['baseline_ms']} -> {reg['median_ms']} ms (x{reg['ratio']})",
+                  file=sys.stderr)
+        status = 1 if out["regressions"] else 0
+    json.dump(out, sys.stdout, indent=2)
+    print()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
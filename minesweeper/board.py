@@ -1,9 +1,81 @@
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple, Iterable, Set
+from functools import lru_cache
+from typing import Callable, List, Tuple, Iterable, Set
+import logging
 import random
 
+import instrument
+
+logger = logging.getLogger(__name__)
+
+# (rows, cols, mines, rng, first click flat index) -> flat mine indices; see noguess.generate
+LayoutGenerator = Callable[[int, int, int, random.Random, int], List[int]]
+
+def make_rng(rng: random.Random | int | None = None) -> Tuple[random.Random, int | None]:
+    """
+    Normalise a seed / RNG argument into (rng, seed).
+
+    An int is used as the seed, reduced modulo 2**64 so that any seed fits a
+    move log; None draws a fresh seed so the board can still be reproduced
+    later; an existing `random.Random` is used as-is (seed None).
+    """
+    if isinstance(rng, random.Random):
+        return rng, None
+    seed = random.SystemRandom().randrange(2**63) if rng is None else int(rng) % 2**64
+    return random.Random(seed), seed
+
+@lru_cache(maxsize=16)
+def neighbor_table(rows: int, cols: int) -> Tuple[Tuple[int, ...], ...]:
+    """Flat neighbour indices of every flat cell index (r * cols + c), cached per board shape."""
+    table = []
+    for r in range(rows):
+        for c in range(cols):
+            table.append(tuple(nr * cols + nc
+                               for nr in (r - 1, r, r + 1) if 0 <= nr < rows
+                               for nc in (c - 1, c, c + 1) if 0 <= nc < cols and (nr, nc) != (r, c)))
+    return tuple(table)
+
+def sample_mine_positions(rows: int, cols: int, mines: int, rng: random.Random,
+                          exclude: Set[Tuple[int,int]] | None = None) -> List[int]:
+    """
+    Pick `mines` distinct flat indices (r * cols + c) outside `exclude`.
+
+    Only the mine positions are sampled (random.sample over a range is O(mines)
+    for sparse boards); excluded cells are skipped by shifting the sampled index
+    past every excluded index at or below it.
+    """
+    excluded = sorted({r * cols + c for r, c in (exclude or ())})
+    picks = rng.sample(range(rows * cols - len(excluded)), mines)
+    if not excluded:
+        return picks
+    out = []
+    for i in picks:
+        for e in excluded:
+            if e > i: break
+            i += 1
+        out.append(i)
+    return out
+
+def log_layout(rows: int, cols: int, cell_repr) -> None:
+    """Dump a board layout at DEBUG level (cell_repr(r, c) -> str)."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    lines = [" ".join(cell_repr(r, c) for c in range(cols)) for r in range(rows)]
+    logger.debug("Initial board layout (M = mine, numbers = adjacent mine counts):\n%s", "\n".join(lines))
+
+@dataclass(frozen=True)
+class BoardSnapshot:
+    """
+    Visible state of a board: one byte per cell for revealed / flagged, plus the
+    counters. The mine layout is not included; it never changes once placed.
+    """
+    revealed: bytes
+    flagged: bytes
+    revealed_safe: int
+    flags: int
+
 @dataclass
 class Cell:
     mine: bool = False
@@ -12,7 +84,9 @@ class Cell:
     flagged: bool = False
 
 class Board:
-    def __init__(self, rows: int, cols: int, mines: int, safe_first_click: bool = True):
+    def __init__(self, rows: int, cols: int, mines: int, safe_first_click: bool = True,
+                 rng: random.Random | int | None = None, check_invariants: bool = False,
+                 generator: LayoutGenerator | None = None):
         assert rows > 0 and cols > 0
         assert 0 < mines < rows * cols
         self.rows = rows
@@ -21,47 +95,79 @@ class Board:
         self.grid: List[List[Cell]] = [[Cell() for _ in range(cols)] for _ in range(rows)]
         self.safe_first_click = safe_first_click
         self._mines_placed = False  # place mines on first click if safe_first_click True
+        self.rng, self.seed = make_rng(rng)
+        # Maintained incrementally by reveal/toggle_flag so win and mines-left
+        # checks never have to scan the grid.
+        self.revealed_safe = 0
+        self.flags = 0
+        self.check_invariants = check_invariants  # debug: verify counters after every move
+        self._changed: Set[Tuple[int,int]] = set()  # cells whose visible state changed, see pop_changes()
+        self.last_opened: List[Tuple[int,int]] = []  # cells the most recent reveal() opened (undo history)
+        self.generator = generator  # custom first-click layout (e.g. no-guess); None = uniform random
+        self._cells: List[Cell] = [cell for row in self.grid for cell in row]  # the same Cells, by flat index
+        self._nbrs = neighbor_table(rows, cols)  # shared by every board of this shape
+        # Zero-region index, built once mines are placed (see _index_zero_regions).
+        self._region: List[int] = [-1] * (rows * cols)   # region of each zero cell, -1 for the rest
+        self._regions: List[List[int]] = []              # cells each region opens: its zeros, then their border
+        self._region_zeros: List[int] = []               # number of zeros in each region
+        self._region_touched: List[int] = []             # zeros of each region that are revealed or flagged
 
     def neighbors(self, r: int, c: int) -> Iterable[Tuple[int,int]]:
-        for dr in (-1,0,1):
-            for dc in (-1,0,1):
-                if dr == 0 and dc == 0: continue
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                    yield nr, nc
-
-    def _place_mines(self, exclude: Set[Tuple[int,int]] | None = None) -> None:
-        exclude = exclude or set()
-        positions = [(r,c) for r in range(self.rows) for c in range(self.cols) if (r,c) not in exclude]
-        random.shuffle(positions)
-        for r,c in positions[:self.mines]:
-            self.grid[r][c].mine = True
-        # compute numbers
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.grid[r][c].mine: 
-                    self.grid[r][c].number = -1
-                    continue
-                n = 0
-                for nr, nc in self.neighbors(r, c):
-                    if self.grid[nr][nc].mine: n += 1
-                self.grid[r][c].number = n
+        cols = self.cols
+        return [divmod(j, cols) for j in self._nbrs[r * cols + c]]
+
+    @instrument.probe()
+    def _place_mines(self, exclude: Set[Tuple[int,int]] | None = None, positions: List[int] | None = None) -> None:
+        if positions is None:
+            positions = sample_mine_positions(self.rows, self.cols, self.mines, self.rng, exclude)
+        cells, nbrs = self._cells, self._nbrs
+        for i in positions:
+            cells[i].mine = True
+        # compute numbers: every mine bumps its neighbours
+        for i in positions:
+            for j in nbrs[i]:
+                cells[j].number += 1
+        for i in positions:
+            cells[i].number = -1
+        self._index_zero_regions()
         self._mines_placed = True
+        log_layout(self.rows, self.cols, lambda r, c: "M" if self.grid[r][c].mine else str(self.grid[r][c].number))
 
-        print("\n[DEBUG] Initial Board Layout (M = mine, numbers = adjacent mine counts):")
-        for r in range(self.rows):
-            row_repr = []
-            for c in range(self.cols):
-                cell = self.grid[r][c]
-                if cell.mine:
-                    row_repr.append("M")
-                else:
-                    row_repr.append(str(cell.number))
-            print(" ".join(row_repr))
-        print()
+    def _index_zero_regions(self) -> None:
+        """
+        Label the 8-connected regions of zero cells. Revealing any zero of a
+        region opens exactly its zeros plus their numbered border, so reveal
+        can open an untouched region straight from the list instead of
+        flood filling it.
+        """
+        cells, nbrs = self._cells, self._nbrs
+        region = self._region = [-1] * len(cells)
+        border_of = [-1] * len(cells)
+        regions, sizes = self._regions, self._region_zeros = [], []
+        touched = self._region_touched = []  # flags may already be down before the first click
+        for i, cell in enumerate(cells):
+            if cell.number != 0 or region[i] >= 0: continue
+            rid = len(regions)
+            region[i] = rid
+            zeros, border = [i], []
+            for z in zeros:  # grows while it is walked: a breadth-first search
+                for j in nbrs[z]:
+                    if cells[j].number == 0:
+                        if region[j] < 0:
+                            region[j] = rid
+                            zeros.append(j)
+                    elif border_of[j] != rid:
+                        border_of[j] = rid
+                        border.append(j)
+            regions.append(zeros + border)
+            sizes.append(len(zeros))
+            touched.append(sum(cells[z].revealed or cells[z].flagged for z in zeros))
 
     def first_click_place(self, fr: int, fc: int) -> None:
         if self._mines_placed: return
+        if self.generator is not None:
+            self._place_mines(positions=self.generator(self.rows, self.cols, self.mines, self.rng, fr * self.cols + fc))
+            return
         if not self.safe_first_click:
             self._place_mines()
             return
@@ -70,35 +176,168 @@ class Board:
         self._place_mines(excl)
 
     def reveal(self, r: int, c: int) -> str:
+        return self.reveal_many(((r, c),))
+
+    @instrument.probe(size=lambda board, _result: len(board.last_opened))
+    def reveal_many(self, cells: Iterable[Tuple[int,int]]) -> str:
+        """
+        Reveal several cells with one shared flood fill; "mine" if any of them
+        was a mine (the others are still revealed, as when a chord hits a mine).
+
+        A zero whose region has no revealed or flagged zero yet opens the whole
+        region from the index; only partly opened regions are flood filled.
+        """
+        board, nbrs, cols = self._cells, self._nbrs, self.cols
+        region, touched = self._region, self._region_touched
+        changed = self._changed
+        opened = self.last_opened = []
+        hit = False
+        stack = []
+        for r, c in cells:
+            i = r * cols + c
+            cell = board[i]
+            if cell.revealed or cell.flagged:
+                continue
+            rid = region[i]
+            if rid >= 0 and not touched[rid]:
+                for j in self._regions[rid]:
+                    ncell = board[j]
+                    if not ncell.revealed and not ncell.flagged:
+                        ncell.revealed = True
+                        rc = divmod(j, cols)
+                        changed.add(rc); opened.append(rc)
+                        self.revealed_safe += 1
+                touched[rid] = self._region_zeros[rid]
+                continue
+            cell.revealed = True
+            changed.add((r, c)); opened.append((r, c))
+            if cell.mine:
+                hit = True
+                continue
+            self.revealed_safe += 1
+            if cell.number == 0:
+                stack.append(i)
+                if rid >= 0: touched[rid] += 1
+        while stack:
+            for j in nbrs[stack.pop()]:
+                ncell = board[j]
+                if ncell.revealed or ncell.flagged:
+                    continue
+                ncell.revealed = True
+                rc = divmod(j, cols)
+                changed.add(rc); opened.append(rc)
+                self.revealed_safe += 1  # neighbours of a zero are never mines
+                if ncell.number == 0:
+                    stack.append(j)
+                    if region[j] >= 0: touched[region[j]] += 1
+        if self.check_invariants: self.verify_counters()
+        return "mine" if hit else "ok"
+
+    def chord(self, r: int, c: int) -> str:
+        """Reveal every unflagged neighbour of a revealed number whose flags already match it."""
         cell = self.grid[r][c]
-        if cell.revealed or cell.flagged:
+        self.last_opened = []
+        if not cell.revealed or cell.mine or cell.number == 0:
             return "ok"
-        cell.revealed = True
-        if cell.mine:
-            return "mine"
-        if cell.number == 0:
-            stack = [(r, c)]
-            seen = set(stack)
-            while stack:
-                cr, cc = stack.pop()
-                for nr, nc in self.neighbors(cr, cc):
-                    ncell = self.grid[nr][nc]
-                    if (nr,nc) in seen or ncell.flagged: 
-                        continue
-                    if not ncell.revealed:
-                        ncell.revealed = True
-                        if not ncell.mine and ncell.number == 0:
-                            stack.append((nr,nc))
-                            seen.add((nr,nc))
-        return "ok"
+        around = list(self.neighbors(r, c))
+        if sum(self.grid[nr][nc].flagged for nr, nc in around) != cell.number:
+            return "ok"
+        return self.reveal_many(around)
 
     def toggle_flag(self, r: int, c: int) -> None:
         cell = self.grid[r][c]
         if cell.revealed: return
         cell.flagged = not cell.flagged
+        self.flags += 1 if cell.flagged else -1
+        rid = self._region[r * self.cols + c]
+        if rid >= 0: self._region_touched[rid] += 1 if cell.flagged else -1
+        self._changed.add((r, c))
+        if self.check_invariants: self.verify_counters()
+
+    def unreveal(self, cells: Iterable[Tuple[int,int]]) -> None:
+        """Cover revealed cells again (undoing a reveal); O(len(cells))."""
+        for r, c in cells:
+            cell = self.grid[r][c]
+            if not cell.revealed: continue
+            cell.revealed = False
+            if not cell.mine: self.revealed_safe -= 1
+            rid = self._region[r * self.cols + c]
+            if rid >= 0: self._region_touched[rid] -= 1
+            self._changed.add((r, c))
+        if self.check_invariants: self.verify_counters()
+
+    def snapshot(self) -> BoardSnapshot:
+        """Compact copy of the visible state; explore from here and restore() to branch cheaply."""
+        cells = self._cells
+        return BoardSnapshot(bytes(cell.revealed for cell in cells), bytes(cell.flagged for cell in cells),
+                             self.revealed_safe, self.flags)
+
+    def restore(self, snap: BoardSnapshot) -> None:
+        """Return to a snapshot of this board; only cells that differ are touched and reported as changed."""
+        cols, region = self.cols, self._region
+        touched = self._region_touched = [0] * len(self._regions)
+        for i, (cell, rev, flag) in enumerate(zip(self._cells, snap.revealed, snap.flagged)):
+            if cell.revealed != rev or cell.flagged != flag:
+                cell.revealed, cell.flagged = bool(rev), bool(flag)
+                self._changed.add(divmod(i, cols))
+            if (rev or flag) and region[i] >= 0:
+                touched[region[i]] += 1
+        self.revealed_safe, self.flags = snap.revealed_safe, snap.flags
+
+    def pop_changes(self) -> Set[Tuple[int,int]]:
+        """Return the cells changed by reveal/toggle_flag since the last call, and reset the record."""
+        changed, self._changed = self._changed, set()
+        return changed
 
     def count_revealed(self) -> int:
+        """Full scan of revealed cells (mines included); see `revealed_safe` for the O(1) counter."""
         return sum(1 for r in range(self.rows) for c in range(self.cols) if self.grid[r][c].revealed)
 
     def count_non_mines(self) -> int:
         return self.rows * self.cols - self.mines
+
+    @instrument.probe()
+    def is_cleared(self) -> bool:
+        """True once every safe cell is revealed (O(1))."""
+        return self.revealed_safe == self.count_non_mines()
+
+    def mines_left(self) -> int:
+        """Mines minus placed flags, floored at 0 (O(1))."""
+        return max(0, self.mines - self.flags)
+
+    def verify_counters(self) -> None:
+        """Check the incremental counters against a full scan; raises AssertionError on drift."""
+        cells = self._cells
+        safe = sum(1 for cell in cells if cell.revealed and not cell.mine)
+        flags = sum(1 for cell in cells if cell.flagged)
+        if (safe, flags) != (self.revealed_safe, self.flags):
+            raise AssertionError(f"counter drift: revealed_safe={self.revealed_safe} (scan {safe}), "
+                                 f"flags={self.flags} (scan {flags})")
+
+
+ENGINES = ("list", "numpy", "chunked")
+
+def make_board(rows: int, cols: int, mines: int, safe_first_click: bool = True, engine: str = "list",
+               rng: random.Random | int | None = None, check_invariants: bool = False,
+               generator: LayoutGenerator | None = None):
+    """
+    Create a board using the given engine ("list" = Cell grid, "numpy" = NumpyBoard,
+    "chunked" = ChunkedBoard, generated lazily for very large boards).
+
+    `generator` replaces the uniform first-click layout, e.g. `noguess.generate`
+    or a `noguess.NoGuessPool(...).take` for boards solvable without guessing.
+    """
+    if engine == "numpy":
+        from npboard import NumpyBoard  # numpy is only needed for this engine
+        return NumpyBoard(rows, cols, mines, safe_first_click=safe_first_click, rng=rng,
+                          check_invariants=check_invariants, generator=generator)
+    if engine == "chunked":
+        if generator is not None:
+            raise ValueError("the chunked engine derives its layout from the seed; it takes no generator")
+        from chunkboard import ChunkedBoard
+        return ChunkedBoard(rows, cols, mines, safe_first_click=safe_first_click, rng=rng,
+                            check_invariants=check_invariants)
+    if engine != "list":
+        raise ValueError(f"unknown board engine: {engine!r}")
+    return Board(rows, cols, mines, safe_first_click=safe_first_click, rng=rng,
+                 check_invariants=check_invariants, generator=generator)
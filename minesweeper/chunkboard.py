@@ -0,0 +1,449 @@
+"""
+chunkboard.py — sparse board for effectively unbounded sizes.
+
+The plane is cut into chunk x chunk squares. A chunk's mines come from its
+own RNG, seeded with the board seed and the chunk coordinates, and every full
+chunk's mine count follows from the board size and seed alone (the requested
+total is spread over the chunks exactly, see `_chunk_mine_count`), so any
+chunk can be produced on demand, in any order, with the same result.
+Nothing is allocated up front:
+
+- mines of a chunk are sampled the first time anything needs them;
+- numbers of a chunk are computed from its own mines and its neighbours'
+  when a cell in it is first read or revealed;
+- revealed / flagged state exists only for chunks a move has touched;
+- what a move opened or changed (`last_opened`, `pop_changes()`) is a
+  `ChunkCells` bitmap per touched chunk, and the flood fill queues its
+  zeros per chunk, so even a huge opening costs bits, not Python objects,
+  per cell.
+
+Memory therefore follows the explored area, not rows * cols; a 10,000 x
+10,000 board costs a few chunks until the player opens more of it.
+Reveal, flood fill, chord, flags and undo behave exactly like `Board`.
+Whole-board tools (solver, probabilities, analytics) still scan every cell,
+so they are only practical on boards of ordinary size.
+"""
+
+from __future__ import annotations
+import random
+from array import array
+from collections.abc import Set as AbstractSet
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import instrument
+from board import make_rng, sample_mine_positions
+
+REVEALED, FLAGGED = 1, 2
+
+
+class _CellView:
+    __slots__ = ("_b", "_r", "_c")
+
+    def __init__(self, board: "ChunkedBoard", r: int, c: int):
+        self._b, self._r, self._c = board, r, c
+
+    @property
+    def mine(self) -> bool:
+        return self._b.is_mine(self._r, self._c)
+
+    @property
+    def number(self) -> int:
+        return self._b.number_at(self._r, self._c)
+
+    @property
+    def revealed(self) -> bool:
+        return bool(self._b._state_at(self._r, self._c) & REVEALED)
+
+    @property
+    def flagged(self) -> bool:
+        return bool(self._b._state_at(self._r, self._c) & FLAGGED)
+
+
+class _RowView:
+    __slots__ = ("_b", "_r")
+
+    def __init__(self, board: "ChunkedBoard", r: int):
+        self._b, self._r = board, r
+
+    def __len__(self) -> int:
+        return self._b.cols
+
+    def __getitem__(self, c: int) -> _CellView:
+        return _CellView(self._b, self._r, c)
+
+    def __iter__(self):
+        return (_CellView(self._b, self._r, c) for c in range(self._b.cols))
+
+
+class _GridView:
+    """Read-only `grid[r][c]` access, like Board.grid; reading a cell may generate its chunk."""
+
+    def __init__(self, board: "ChunkedBoard"):
+        self._b = board
+
+    def __len__(self) -> int:
+        return self._b.rows
+
+    def __getitem__(self, r: int) -> _RowView:
+        return _RowView(self._b, r)
+
+    def __iter__(self):
+        return (_RowView(self._b, r) for r in range(self._b.rows))
+
+
+class ChunkCells(AbstractSet):
+    """
+    A set of (r, c) cells stored as one bitmap per chunk. It iterates, tests
+    membership and compares like a set of tuples, but holds one bit per cell
+    of each chunk it touches.
+    """
+
+    __slots__ = ("chunk", "_bits", "_len")
+
+    def __init__(self, chunk: int):
+        self.chunk = chunk
+        self._bits: Dict[Tuple[int,int], bytearray] = {}
+        self._len = 0
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return set(it)   # results of &, |, - are ordinary sets
+
+    def add_local(self, cy: int, cx: int, li: int) -> None:
+        """Add local cell li of chunk (cy, cx)."""
+        bits = self._bits.get((cy, cx))
+        if bits is None:
+            k = self.chunk
+            bits = self._bits[(cy, cx)] = bytearray((k * k + 7) // 8)
+        mask = 1 << (li & 7)
+        if not bits[li >> 3] & mask:
+            bits[li >> 3] |= mask
+            self._len += 1
+
+    def add(self, rc: Tuple[int,int]) -> None:
+        r, c = rc
+        k = self.chunk
+        self.add_local(r // k, c // k, (r % k) * k + c % k)
+
+    def __contains__(self, rc) -> bool:
+        r, c = rc
+        k = self.chunk
+        bits = self._bits.get((r // k, c // k))
+        li = (r % k) * k + c % k
+        return bits is not None and bool(bits[li >> 3] >> (li & 7) & 1)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def by_chunk(self) -> Iterator[Tuple[Tuple[int,int], List[int]]]:
+        """(chunk, local indices) for every chunk holding cells."""
+        for key, bits in self._bits.items():
+            local = []
+            for i, byte in enumerate(bits):
+                while byte:
+                    low = byte & -byte
+                    local.append(i * 8 + low.bit_length() - 1)
+                    byte ^= low
+            yield key, local
+
+    def __iter__(self) -> Iterator[Tuple[int,int]]:
+        k = self.chunk
+        for (cy, cx), local in self.by_chunk():
+            r0, c0 = cy * k, cx * k
+            for li in local:
+                yield r0 + li // k, c0 + li % k
+
+
+@dataclass(frozen=True)
+class ChunkSnapshot:
+    """Visible state of the touched chunks only (see ChunkedBoard.snapshot)."""
+    state: Dict[Tuple[int,int], bytes]
+    revealed_safe: int
+    flags: int
+
+
+class ChunkedBoard:
+    def __init__(self, rows: int, cols: int, mines: int, safe_first_click: bool = True,
+                 rng: random.Random | int | None = None, check_invariants: bool = False,
+                 chunk: int = 64, per_chunk: int | None = None):
+        """
+        The board holds exactly `mines` mines. `per_chunk` instead gives every
+        full chunk that many (edge chunks their share by area), as boards logged
+        before exact totals did; `self.mines` is then the resulting total.
+        """
+        assert rows > 0 and cols > 0 and 1 < chunk <= 256  # local indices fit in 16 bits
+        assert 0 < mines < rows * cols
+        self.rows, self.cols, self.chunk = rows, cols, chunk
+        rng, seed = make_rng(rng)
+        # Chunks are generated from the seed, so there must be one even when an RNG was passed in.
+        self.rng, self.seed = rng, (seed if seed is not None else rng.getrandbits(63))
+        self.per_chunk = per_chunk
+        self._ny, self._nx = -(-rows // chunk), -(-cols // chunk)
+        # Every chunk keeps one cell free for a safe first click.
+        self._capacity = rows * cols - self._ny * self._nx
+        if per_chunk is None:
+            if mines > self._capacity:
+                raise ValueError(f"at most {self._capacity} mines fit a {rows}x{cols} chunked board")
+            self.mines = mines
+            self._phase = random.Random(f"{self.seed}/phase").randrange(self._capacity)
+        else:
+            self.mines = sum(self._legacy_mine_count(h * w) * nh * nw
+                             for h, nh in self._spans(rows) for w, nw in self._spans(cols))
+        self.grid = _GridView(self)
+        self.safe_first_click = safe_first_click
+        self._mines_placed = False
+        self._safe_cell: Tuple[int,int] | None = None
+        self._mine: Dict[Tuple[int,int], Tuple[bytearray, array]] = {}       # chunk -> (mine bitmap, local indices)
+        self._number: Dict[Tuple[int,int], bytearray] = {}
+        self._state: Dict[Tuple[int,int], bytearray] = {}                    # chunk -> REVEALED / FLAGGED bits
+        self.revealed_safe = 0
+        self.flags = 0
+        self.check_invariants = check_invariants
+        self._changed = ChunkCells(chunk)       # cells whose visible state changed, see pop_changes()
+        self.last_opened = ChunkCells(chunk)    # cells the most recent reveal opened (undo history)
+
+    # ----- layout -----
+
+    def _spans(self, n: int) -> List[Tuple[int, int]]:
+        """(chunk extent, how many chunks have it) along an axis of length n."""
+        full, rest = divmod(n, self.chunk)
+        return [(self.chunk, full)] + ([(rest, 1)] if rest else [])
+
+    def _chunk_mine_count(self, cy: int, cx: int, h: int, w: int) -> int:
+        """
+        Mines in chunk (cy, cx) of extent h x w. The chunks' capacities (cells
+        minus the one kept free) are laid end to end in row-major order and
+        the mines are spaced evenly along them, shifted by a seeded phase; a
+        chunk holds the mines that fall in its stretch. That is its share of
+        the total, rounded up or down, and the counts add up to `self.mines`.
+        """
+        if self.per_chunk is not None:
+            return self._legacy_mine_count(h * w)
+        k = self.chunk
+        before = cy * k * self.cols + cx * k * h - (cy * self._nx + cx)   # capacity of the chunks before this one
+        after = before + h * w - 1
+        m, cap, phase = self.mines, self._capacity, self._phase
+        return (m * after + phase) // cap - (m * before + phase) // cap
+
+    def _legacy_mine_count(self, cells: int) -> int:
+        if cells == self.chunk * self.chunk:
+            n = self.per_chunk
+        else:
+            n = round(self.per_chunk * cells / (self.chunk * self.chunk))
+        return min(n, cells - 1)   # leave room for a safe first click
+
+    def _mines_of(self, cy: int, cx: int) -> Tuple[bytearray, array]:
+        key = (cy, cx)
+        got = self._mine.get(key)
+        if got is None:
+            got = self._mine[key] = self._place_chunk(cy, cx)
+        return got
+
+    @instrument.probe()
+    def _place_chunk(self, cy: int, cx: int) -> Tuple[bytearray, array]:
+        """Draw one chunk's mines from its own seed; the chunked engine's mine placement."""
+        k = self.chunk
+        h, w = min(k, self.rows - cy * k), min(k, self.cols - cx * k)
+        exclude = None
+        if self._safe_cell is not None and (self._safe_cell[0] // k, self._safe_cell[1] // k) == (cy, cx):
+            exclude = {(self._safe_cell[0] - cy * k, self._safe_cell[1] - cx * k)}
+        rng = random.Random(f"{self.seed}/{cy}/{cx}")
+        bits, local = bytearray(k * k), array("H")
+        for i in sample_mine_positions(h, w, self._chunk_mine_count(cy, cx, h, w), rng, exclude):
+            li = (i // w) * k + i % w
+            bits[li] = 1
+            local.append(li)
+        return bits, local
+
+    def _numbers_of(self, cy: int, cx: int) -> bytearray:
+        key = (cy, cx)
+        num = self._number.get(key)
+        if num is None:
+            k = self.chunk
+            num = bytearray(k * k)
+            r0, c0 = cy * k, cx * k
+            for ny in (cy - 1, cy, cy + 1):
+                if not 0 <= ny < self._ny: continue
+                for nx in (cx - 1, cx, cx + 1):
+                    if not 0 <= nx < self._nx: continue
+                    for li in self._mines_of(ny, nx)[1]:
+                        mr, mc = ny * k + li // k - r0, nx * k + li % k - c0   # mine, in this chunk's coordinates
+                        if mr < -1 or mr > k or mc < -1 or mc > k: continue
+                        for lr in (mr - 1, mr, mr + 1):
+                            if 0 <= lr < k:
+                                for lc in (mc - 1, mc, mc + 1):
+                                    if 0 <= lc < k and (lr, lc) != (mr, mc):
+                                        num[lr * k + lc] += 1
+            self._number[key] = num
+        return num
+
+    def is_mine(self, r: int, c: int) -> bool:
+        if not self._mines_placed: return False
+        k = self.chunk
+        return bool(self._mines_of(r // k, c // k)[0][(r % k) * k + c % k])
+
+    def number_at(self, r: int, c: int) -> int:
+        if not self._mines_placed: return 0
+        if self.is_mine(r, c): return -1
+        k = self.chunk
+        return self._numbers_of(r // k, c // k)[(r % k) * k + c % k]
+
+    def _state_at(self, r: int, c: int) -> int:
+        k = self.chunk
+        st = self._state.get((r // k, c // k))
+        return st[(r % k) * k + c % k] if st is not None else 0
+
+    def _state_of(self, cy: int, cx: int) -> bytearray:
+        st = self._state.get((cy, cx))
+        if st is None:
+            st = self._state[(cy, cx)] = bytearray(self.chunk * self.chunk)
+        return st
+
+    def first_click_place(self, fr: int, fc: int) -> None:
+        if self._mines_placed: return
+        if self.safe_first_click:
+            self._safe_cell = (fr, fc)   # its chunk is generated with this cell left clear
+        self._mines_placed = True
+
+    # ----- moves -----
+
+    def neighbors(self, r: int, c: int) -> Iterable[Tuple[int,int]]:
+        for dr in (-1,0,1):
+            for dc in (-1,0,1):
+                if dr == 0 and dc == 0: continue
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                    yield nr, nc
+
+    def reveal(self, r: int, c: int) -> str:
+        return self.reveal_many(((r, c),))
+
+    @instrument.probe(size=lambda board, _result: len(board.last_opened))
+    def reveal_many(self, cells: Iterable[Tuple[int,int]]) -> str:
+        """
+        Reveal several cells with one shared flood fill. Zeros still to expand
+        are queued per chunk as local indices, so the fill, like the opened
+        and changed sets, takes memory per touched chunk, not per cell.
+        """
+        k = self.chunk
+        changed = self._changed
+        opened = self.last_opened = ChunkCells(k)
+        hit = False
+        pending: Dict[Tuple[int,int], array] = {}   # chunk -> local indices of opened zeros to expand
+
+        def open_cell(r, c):
+            # Reveal one covered, unflagged cell; returns its number (-1 for a mine) or None if skipped.
+            cy, cx, li = r // k, c // k, (r % k) * k + c % k
+            st = self._state_of(cy, cx)
+            if st[li]: return None   # already revealed, or flagged
+            st[li] = REVEALED
+            changed.add_local(cy, cx, li); opened.add_local(cy, cx, li)
+            if self._mines_of(cy, cx)[0][li]: return -1
+            self.revealed_safe += 1
+            n = self._numbers_of(cy, cx)[li]
+            if n == 0:
+                todo = pending.get((cy, cx))
+                if todo is None: todo = pending[(cy, cx)] = array("H")
+                todo.append(li)
+            return n
+
+        for r, c in cells:
+            if open_cell(r, c) == -1: hit = True
+        while pending:
+            (cy, cx), todo = pending.popitem()
+            r0, c0 = cy * k, cx * k
+            while todo:
+                li = todo.pop()
+                for nr, nc in self.neighbors(r0 + li // k, c0 + li % k):
+                    open_cell(nr, nc)   # neighbours of a zero are never mines; new zeros are queued
+        if self.check_invariants: self.verify_counters()
+        return "mine" if hit else "ok"
+
+    def chord(self, r: int, c: int) -> str:
+        self.last_opened = ChunkCells(self.chunk)
+        if not self._state_at(r, c) & REVEALED or self.is_mine(r, c) or self.number_at(r, c) == 0:
+            return "ok"
+        around = list(self.neighbors(r, c))
+        if sum(bool(self._state_at(nr, nc) & FLAGGED) for nr, nc in around) != self.number_at(r, c):
+            return "ok"
+        return self.reveal_many(around)
+
+    def toggle_flag(self, r: int, c: int) -> None:
+        k = self.chunk
+        st, li = self._state_of(r // k, c // k), (r % k) * k + c % k
+        if st[li] & REVEALED: return
+        st[li] ^= FLAGGED
+        self.flags += 1 if st[li] & FLAGGED else -1
+        self._changed.add_local(r // k, c // k, li)
+        if self.check_invariants: self.verify_counters()
+
+    def unreveal(self, cells: Iterable[Tuple[int,int]]) -> None:
+        k = self.chunk
+        if isinstance(cells, ChunkCells):  # a move's own ChunkCells (undo): work chunk by chunk
+            for (cy, cx), local in cells.by_chunk():
+                st, mine = self._state_of(cy, cx), self._mines_of(cy, cx)[0]
+                for li in local:
+                    if not st[li] & REVEALED: continue
+                    st[li] &= ~REVEALED
+                    if not mine[li]: self.revealed_safe -= 1
+                    self._changed.add_local(cy, cx, li)
+            if self.check_invariants: self.verify_counters()
+            return
+        for r, c in cells:
+            st, li = self._state_of(r // k, c // k), (r % k) * k + c % k
+            if not st[li] & REVEALED: continue
+            st[li] &= ~REVEALED
+            if not self.is_mine(r, c): self.revealed_safe -= 1
+            self._changed.add_local(r // k, c // k, li)
+        if self.check_invariants: self.verify_counters()
+
+    def snapshot(self) -> ChunkSnapshot:
+        """Copy of the touched chunks' state; O(touched area), not O(rows * cols)."""
+        return ChunkSnapshot({key: bytes(st) for key, st in self._state.items()}, self.revealed_safe, self.flags)
+
+    def restore(self, snap: ChunkSnapshot) -> None:
+        k = self.chunk
+        blank = bytes(k * k)
+        for key in set(self._state) | set(snap.state):
+            old, new = self._state.get(key, blank), snap.state.get(key, blank)
+            if old == new: continue
+            for li in range(k * k):
+                if old[li] != new[li]:
+                    self._changed.add_local(key[0], key[1], li)
+            self._state[key] = bytearray(new)
+        self.revealed_safe, self.flags = snap.revealed_safe, snap.flags
+
+    # ----- counters, as on Board -----
+
+    def pop_changes(self) -> ChunkCells:
+        changed, self._changed = self._changed, ChunkCells(self.chunk)
+        return changed
+
+    def count_revealed(self) -> int:
+        return sum(1 for st in self._state.values() for v in st if v & REVEALED)
+
+    def count_non_mines(self) -> int:
+        return self.rows * self.cols - self.mines
+
+    @instrument.probe()
+    def is_cleared(self) -> bool:
+        return self.revealed_safe == self.count_non_mines()
+
+    def mines_left(self) -> int:
+        return max(0, self.mines - self.flags)
+
+    def chunks_in_memory(self) -> Dict[str, int]:
+        """How many chunks hold mines / numbers / visible state (memory follows these, not the board size)."""
+        return {"mines": len(self._mine), "numbers": len(self._number), "state": len(self._state)}
+
+    def verify_counters(self) -> None:
+        k = self.chunk
+        safe = flags = 0
+        for (cy, cx), st in self._state.items():
+            for li, v in enumerate(st):
+                if v & FLAGGED: flags += 1
+                if v & REVEALED and not self.is_mine(cy * k + li // k, cx * k + li % k): safe += 1
+        if (safe, flags) != (self.revealed_safe, self.flags):
+            raise AssertionError(f"counter drift: revealed_safe={self.revealed_safe} (scan {safe}), "
+                                 f"flags={self.flags} (scan {flags})")
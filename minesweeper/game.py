@@ -1,7 +1,36 @@
 
 from __future__ import annotations
+import random
 import time
-from board import Board
+from dataclasses import dataclass
+from typing import Collection, List, Tuple
+from board import Board, BoardSnapshot, make_board
+import instrument
+import movelog
+
+@dataclass(frozen=True)
+class Move:
+    """
+    One undoable step: what it changed, not a copy of the board.
+
+    `opened` lists the cells a reveal, chord or batch uncovered (flood fill
+    included; a ChunkedBoard's compact ChunkCells as it is); a flag move is
+    its own inverse. `before` is (won, lost) prior
+    to the move; `cells` are the requested cells of a batch.
+    """
+    kind: str                          # "reveal", "chord", "batch" or "flag"
+    r: int
+    c: int
+    opened: Collection[Tuple[int,int]]
+    before: Tuple[bool, bool]
+    cells: Tuple[Tuple[int,int], ...] = ()
+
+@dataclass(frozen=True)
+class GameSnapshot:
+    board: BoardSnapshot
+    won: bool
+    lost: bool
+    history: Tuple[Move, ...]
 
 class Game:
     def __init__(self, board: Board):
@@ -10,6 +39,15 @@ class Game:
         self.start_time = None
         self.won = False
         self.lost = False
+        self.history: List[Move] = []   # applied moves, oldest first
+        self._redo: List[Move] = []     # undone moves, most recent last
+        self.undos = 0                  # how often undo was used (e.g. to keep such times off the high scores)
+        self.log = movelog.MoveLog(board.rows, board.cols, board.mines, board.seed)  # inputs, for replays
+
+    @property
+    def seed(self) -> int | None:
+        """Seed the board's mine layout was drawn from (None if an RNG object was passed)."""
+        return self.board.seed
 
     @property
     def elapsed(self) -> float:
@@ -17,23 +55,122 @@ class Game:
             return 0.0
         return max(0.0, time.time() - self.start_time)
 
-    def click(self, r: int, c: int) -> str:
-        if not self.started:
-            self.board.first_click_place(r, c)
-            self.started = True
-            self.start_time = time.time()
+    def _start(self, r: int, c: int) -> None:
+        self.board.first_click_place(r, c)
+        self.started = True
+        self.start_time = time.time()
+        self.log.layout(self.board)
 
-        result = self.board.reveal(r, c)
+    def _opened(self) -> Collection[Tuple[int,int]]:
+        # Lists become tuples like the rest of Move; ChunkCells are made per move and never changed after it.
+        opened = self.board.last_opened
+        return tuple(opened) if isinstance(opened, list) else opened
+
+    def _finish(self, move: Move, result: str) -> str:
+        # One history entry and one win check per move, however many cells it opened.
+        if self.board.last_opened:
+            self._record(move)
         if result == "mine":
             self.lost = True
             return "mine"
-
-        if self.board.count_revealed() == self.board.count_non_mines():
+        if self.board.is_cleared():
             self.won = True
         return "ok"
 
+    @instrument.probe()
+    def click(self, r: int, c: int) -> str:
+        if not self.started:
+            self._start(r, c)
+        self.log.record(movelog.REVEAL, r, c)
+        before = (self.won, self.lost)
+        result = self.board.reveal(r, c)
+        return self._finish(Move("reveal", r, c, self._opened(), before), result)
+
+    @instrument.probe()
+    def click_many(self, cells) -> str:
+        """Reveal several cells as one move: one flood fill, one win check, one undo step."""
+        cells = tuple(cells)
+        if not cells: return "ok"
+        if not self.started:
+            self._start(*cells[0])
+        self.log.batch(cells)
+        before = (self.won, self.lost)
+        result = self.board.reveal_many(cells)
+        return self._finish(Move("batch", *cells[0], self._opened(), before, cells), result)
+
+    @instrument.probe()
+    def chord(self, r: int, c: int) -> str:
+        """Classic chord: on a revealed number whose flags are all placed, reveal its other neighbours."""
+        if not self.started: return "ok"
+        self.log.record(movelog.CHORD, r, c)
+        before = (self.won, self.lost)
+        result = self.board.chord(r, c)
+        return self._finish(Move("chord", r, c, self._opened(), before), result)
+
+    @instrument.probe()
     def flag(self, r: int, c: int) -> None:
+        self.log.record(movelog.FLAG, r, c)
+        if self.board.grid[r][c].revealed: return
         self.board.toggle_flag(r, c)
+        self._record(Move("flag", r, c, (), (self.won, self.lost)))
+
+    # ----- Undo / redo -----
+    def _record(self, move: Move) -> None:
+        self.history.append(move)
+        self._redo.clear()
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.history)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @instrument.probe()
+    def undo(self) -> Move | None:
+        """Take back the last move in O(cells it changed); returns it, or None if there is none."""
+        self.log.record(movelog.UNDO)
+        if not self.history: return None
+        move = self.history.pop()
+        if move.kind == "flag":
+            self.board.toggle_flag(move.r, move.c)
+        else:
+            self.board.unreveal(move.opened)
+        self.won, self.lost = move.before
+        self._redo.append(move)
+        self.undos += 1
+        return move
+
+    @instrument.probe()
+    def redo(self) -> Move | None:
+        """Re-apply the last undone move; returns it, or None if there is none."""
+        self.log.record(movelog.REDO)
+        if not self._redo: return None
+        move = self._redo.pop()
+        if move.kind == "flag":
+            self.board.toggle_flag(move.r, move.c)
+        else:
+            # Same layout, same visible state as when it was recorded: the move opens the same cells.
+            if move.kind == "chord": result = self.board.chord(move.r, move.c)
+            elif move.kind == "batch": result = self.board.reveal_many(move.cells)
+            else: result = self.board.reveal(move.r, move.c)
+            self.lost = result == "mine"
+            self.won = not self.lost and self.board.is_cleared()
+        self.history.append(move)
+        return move
+
+    # ----- Snapshots -----
+    def snapshot(self) -> GameSnapshot:
+        """Cheap full copy of the game's visible state and history (the mine layout is shared)."""
+        return GameSnapshot(self.board.snapshot(), self.won, self.lost, tuple(self.history))
+
+    def restore(self, snap: GameSnapshot) -> None:
+        """Go back to a snapshot of this game; the redo stack is cleared."""
+        self.board.restore(snap.board)
+        self.won, self.lost = snap.won, snap.lost
+        self.history = list(snap.history)
+        self._redo.clear()
 
 
 class MinesweeperGame:
@@ -47,8 +184,9 @@ class MinesweeperGame:
 
     MINE = -1
 
-    def __init__(self, rows: int, cols: int, mines: int, safe_first_click: bool = True):
-        self._board = Board(rows, cols, mines, safe_first_click=safe_first_click)
+    def __init__(self, rows: int, cols: int, mines: int, safe_first_click: bool = True, engine: str = "list",
+                 rng: random.Random | int | None = None):
+        self._board = make_board(rows, cols, mines, safe_first_click=safe_first_click, engine=engine, rng=rng)
         self._rows = rows
         self._cols = cols
         self._safe_first_click = safe_first_click
@@ -62,4 +200,11 @@ class MinesweeperGame:
 
     @property
     def board(self):
-        return [[cell.number for cell in row] for row in self._board.grid]
+        if isinstance(self._board, Board):
+            return [[cell.number for cell in row] for row in self._board.grid]
+        if hasattr(self._board, "number_at"):  # ChunkedBoard: no full arrays, read cell by cell
+            number_at = self._board.number_at
+            return [[number_at(r, c) for c in range(self._cols)] for r in range(self._rows)]
+        numbers = self._board.number.astype(int)
+        numbers[self._board.mine] = self.MINE
+        return numbers.tolist()
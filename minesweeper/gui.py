@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
 import tkinter as tk
-from tkinter import messagebox, simpledialog
+from tkinter import filedialog, messagebox, simpledialog, ttk
 import subprocess
 
-from board import Board
+from board import make_board
 from game import Game
 from config import EASY, INTERMEDIATE, EXPERT, Difficulty
 import highscores
-import analytics     # <- THIS is important
+import instrument
+import solver
+import probability
+import noguess
+import movelog
+# analytics (NumPy + Matplotlib) is imported on first use in _run_analytics_info
 
 BOMB = "💣"
 FLAG = "🚩"
@@ -16,17 +27,35 @@ SMILE = "😊"
 DEAD  = "☠️"
 COOL  = "😎"
 
+logger = logging.getLogger(__name__)
+
+TILES_MAX_DIM = 60
+ANALYTICS_MAX_BOARDS = 1_000_000
+CANVAS_MAX_DIM = 300
+
 class Launcher(tk.Tk):
-    def __init__(self):
+    def __init__(self, skip_splash=False, started_at=None, on_interactive=None):
+        """
+        skip_splash:    build the menu immediately instead of the fade-in splash
+        started_at:     time.perf_counter() value startup is measured from (default: now)
+        on_interactive: called with the time-to-interactive in seconds once the menu is usable
+        """
+        self._started_at = time.perf_counter() if started_at is None else started_at
+        self._on_interactive = on_interactive
+        self.startup_seconds = None
         super().__init__()
         self.title("Minesweeper")
         self.resizable(False, False)
         self.theme = "system"
         self.colorblind = False
         self.safe_first_click = True
+        self.no_guess = False
+        self.board_engine = "list"
+        self.renderer = "tiles"
         self._sys_theme = "light"
         self.withdraw()
-        self._show_splash_then_build()
+        if skip_splash: self._end_splash_and_build()
+        else: self._show_splash_then_build()
 
     def _get_system_theme(self) -> str:
         try:
@@ -84,6 +113,14 @@ class Launcher(tk.Tk):
         self.deiconify()
         self._build_menu()
         self._auto_apply_system_theme()
+        self.after_idle(self._mark_interactive)
+
+    def _mark_interactive(self):
+        # Runs once the menu has been laid out and drawn, i.e. it accepts clicks.
+        self.update_idletasks()
+        self.startup_seconds = time.perf_counter() - self._started_at
+        logger.info("time to interactive menu: %.1f ms", self.startup_seconds * 1000)
+        if self._on_interactive: self._on_interactive(self.startup_seconds)
 
     def _build_menu(self):
         min_w, min_h = 560, 520
@@ -119,6 +156,7 @@ class Launcher(tk.Tk):
         add_btn("Custom",         self._start_custom)
         add_btn("High Scores",    self._show_highscores_dialog, top=14)
         add_btn("Run Analytics…", self._run_analytics_info)
+        add_btn("Replay…",        self._open_replay)
 
         self.settings_icon = tk.Label(self, text="⚙️", cursor="arrow")
         self.settings_icon.place(relx=0.02, rely=0.98, anchor="sw")
@@ -182,12 +220,27 @@ class Launcher(tk.Tk):
         sfc_var = tk.BooleanVar(value=self.safe_first_click)
         tk.Label(frm, text="Safe-first-click").grid(row=2, column=0, sticky="w")
         tk.Checkbutton(frm, variable=sfc_var, text="Enable").grid(row=2, column=1, sticky="w")
+        ng_var = tk.BooleanVar(value=self.no_guess)
+        tk.Checkbutton(frm, variable=ng_var, text="No-guess boards").grid(row=2, column=2, columnspan=2, sticky="w")
 
-        btns = tk.Frame(frm); btns.grid(row=3, column=0, columnspan=4, pady=(10,0), sticky="e")
+        tk.Label(frm, text="Board engine").grid(row=3, column=0, sticky="w")
+        engine_var = tk.StringVar(value=self.board_engine)
+        for i, (name, label) in enumerate([("list", "Standard"), ("numpy", "NumPy"), ("chunked", "Chunked")]):
+            tk.Radiobutton(frm, text=label, variable=engine_var, value=name).grid(row=3, column=1+i, sticky="w")
+
+        tk.Label(frm, text="Renderer").grid(row=4, column=0, sticky="w")
+        renderer_var = tk.StringVar(value=self.renderer)
+        for i, (name, label) in enumerate([("tiles", "Tiles"), ("canvas", "Canvas")]):
+            tk.Radiobutton(frm, text=label, variable=renderer_var, value=name).grid(row=4, column=1+i, sticky="w")
+
+        btns = tk.Frame(frm); btns.grid(row=5, column=0, columnspan=4, pady=(10,0), sticky="e")
         def apply_and_close():
             self.theme = theme_var.get()
             self.colorblind = cb_var.get()
             self.safe_first_click = bool(sfc_var.get())
+            self.no_guess = bool(ng_var.get())
+            self.board_engine = engine_var.get()
+            self.renderer = renderer_var.get()
             if self.theme == "system":
                 self._sys_theme = self._get_system_theme()
             self._apply_menu_theme()
@@ -197,23 +250,56 @@ class Launcher(tk.Tk):
         tk.Button(btns, text="Apply", command=apply_and_close).pack(side="right")
 
     def _start(self, diff):
+        try:
+            game = MinesweeperWindow(self, diff.rows, diff.cols, diff.mines,
+                                     theme=self._resolved_theme(),
+                                     colorblind=self.colorblind,
+                                     safe_first_click=self.safe_first_click,
+                                     no_guess=self.no_guess,
+                                     engine=self.board_engine,
+                                     renderer=self.renderer)
+        except ValueError as e:  # e.g. too many mines for the chunked engine
+            messagebox.showerror("New game", f"Could not create this board:\n{e}", parent=self)
+            return
+        self.withdraw()
+        game.protocol("WM_DELETE_WINDOW", lambda: (game.destroy(), self.deiconify()))
+        game.mainloop()
+
+    def _open_replay(self):
+        path = filedialog.askopenfilename(parent=self, title="Open replay",
+                                          filetypes=[("Minesweeper replays", "*.mslog"), ("All files", "*")])
+        if not path: return
+        try:
+            with open(path, "rb") as f:
+                log = movelog.read(f.read())
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Replay", f"Could not read {os.path.basename(path)}:\n{e}", parent=self)
+            return
+        try:
+            game = MinesweeperWindow(self, log.rows, log.cols, log.mines,
+                                     theme=self._resolved_theme(),
+                                     colorblind=self.colorblind,
+                                     engine=self.board_engine,
+                                     renderer=self.renderer,
+                                     replay=log)
+        except ValueError as e:
+            messagebox.showerror("Replay", f"Could not replay {os.path.basename(path)}:\n{e}", parent=self)
+            return
         self.withdraw()
-        game = MinesweeperWindow(self, diff.rows, diff.cols, diff.mines,
-                                 theme=self._resolved_theme(),
-                                 colorblind=self.colorblind,
-                                 safe_first_click=self.safe_first_click)
         game.protocol("WM_DELETE_WINDOW", lambda: (game.destroy(), self.deiconify()))
         game.mainloop()
 
     def _prompt_custom_board(self, title="Custom Board"):
+        # The canvas renderer has no per-cell widgets, so it can afford much larger boards.
+        max_dim = CANVAS_MAX_DIM if self.renderer == "canvas" else TILES_MAX_DIM
         rows = simpledialog.askinteger(
-            title, "Rows (5-60):", parent=self, minvalue=5, maxvalue=60
+            title, f"Rows (5-{max_dim}):", parent=self, minvalue=5, maxvalue=max_dim
         )
         if rows is None:
             return None
 
         cols = simpledialog.askinteger(
-            title, "Columns (5-60):", parent=self, minvalue=5, maxvalue=60
+            title, f"Columns (5-{max_dim}):", parent=self, minvalue=5, maxvalue=max_dim
         )
         if cols is None:
             return None
@@ -269,6 +355,10 @@ class Launcher(tk.Tk):
         lines = [f"Top 10 for {rows}x{cols} with {mines} mines:\n"]
         for i, s in enumerate(top, 1):
             lines.append(f"{i:2d}. {s['name']:<12} {s['time']:.2f}s  ({s['when']})")
+        _, total = highscores.get_rank(rows, cols, mines, float("inf"))
+        pct = highscores.get_percentiles(rows, cols, mines)
+        if pct:
+            lines.append(f"\n{total:,} results — " + ", ".join(f"p{p}: {t:.2f}s" for p, t in pct.items()))
         tk.messagebox.showinfo("High Scores", "\n".join(lines))
 
     def _run_analytics_info(self):
@@ -276,7 +366,7 @@ class Launcher(tk.Tk):
         GUI entry for analytics:
         - Ask user for difficulty (Easy / Intermediate / Expert / Custom)
         - Ask user for number of boards
-        - Generate boards and show ALL plots in one window.
+        - Generate boards in the background and show ALL plots in one window.
         """
         # Choose difficulty for analytics
         choice = simpledialog.askstring(
@@ -313,20 +403,72 @@ class Launcher(tk.Tk):
             "How many random boards to generate?",
             parent=self,
             minvalue=5,
-            maxvalue=500,
+            maxvalue=ANALYTICS_MAX_BOARDS,
         )
         if not n:
             return
 
-        rows, cols, mines = diff.rows, diff.cols, diff.mines
+        self._run_analytics_background(diff.rows, diff.cols, diff.mines, n)
 
-        # Generate boards & show all plots in a single figure
-        boards = analytics.gen_boards(rows, cols, mines, n)
-        if not boards:
-            messagebox.showinfo("Analytics", "No boards generated.", parent=self)
-            return
-
-        analytics.show_all_plots(boards)
+    def _run_analytics_background(self, rows, cols, mines, n):
+        """
+        Run analytics.compute_stats on a worker thread (which fans out to a
+        process pool) while a progress dialog polls for updates with after();
+        the plot window opens once the results are in.
+        """
+        import analytics
+
+        dlg = tk.Toplevel(self)
+        dlg.title("Analytics")
+        dlg.resizable(False, False)
+        dlg.transient(self)
+        frm = tk.Frame(dlg, padx=16, pady=14); frm.pack(fill="both", expand=True)
+        status_var = tk.StringVar(value=f"Generating {n:,} boards of {rows}x{cols} with {mines} mines…")
+        tk.Label(frm, textvariable=status_var).pack(anchor="w")
+        bar = ttk.Progressbar(frm, length=320, maximum=n, mode="determinate"); bar.pack(pady=10)
+
+        cancel = threading.Event()
+        events = queue.Queue()
+        cancel_btn = tk.Button(frm, text="Cancel", command=lambda: (cancel.set(), status_var.set("Cancelling…")))
+        cancel_btn.pack(anchor="e")
+        dlg.protocol("WM_DELETE_WINDOW", cancel.set)
+
+        def work():
+            # Never touch Tk from this thread: report through the queue only.
+            try:
+                stats = analytics.compute_stats(
+                    rows, cols, mines, n,
+                    workers=os.cpu_count() or 1,
+                    progress=lambda done: events.put(("progress", done)),
+                    cancel=cancel,
+                    mp_context=multiprocessing.get_context("spawn"),  # no fork() of the Tk process
+                )
+                events.put(("done", stats))
+            except analytics.Cancelled:
+                events.put(("cancelled", None))
+            except Exception as exc:
+                events.put(("error", exc))
+
+        def poll():
+            try:
+                while True:
+                    kind, value = events.get_nowait()
+                    if kind == "progress":
+                        bar["value"] = value
+                        status_var.set(f"Generated {value:,} / {n:,} boards…")
+                        continue
+                    dlg.destroy()
+                    if kind == "done":
+                        analytics.show_stats(value)
+                    elif kind == "error":
+                        messagebox.showerror("Analytics", f"Analytics failed:\n{value}", parent=self)
+                    return
+            except queue.Empty:
+                pass
+            self.after(100, poll)
+
+        threading.Thread(target=work, name="analytics", daemon=True).start()
+        self.after(100, poll)
 
 
 
@@ -368,6 +510,12 @@ class Tile(tk.Frame):
         self.right.config(bg=self.pal["tile_rev_bg"]); self.bottom.config(bg=self.pal["tile_rev_bg"])
         self.center.config(bg=self.pal["tile_rev_bg"]); self.label.config(bg=self.pal["tile_rev_bg"])
 
+    def set_hover(self):
+        self.center.config(bg=self.pal["tile_unrev_hover"]); self.label.config(bg=self.pal["tile_unrev_hover"])
+
+    def set_shade(self, bg):
+        self.center.config(bg=bg); self.label.config(bg=bg)
+
     def set_text(self, text, fg=None):
         self.label.config(text=text, fg=(fg or self.pal["tile_fg"]))
 
@@ -377,8 +525,141 @@ class Tile(tk.Frame):
     def set_mine(self, fg=None):
         self.set_revealed_base(); self.set_text(BOMB, (fg or self.pal["mine_fg"]))
 
+class CanvasTile:
+    """One cell of a CanvasBoard; offers the same painting methods as Tile."""
+
+    __slots__ = ("board", "face", "light", "dark", "text")
+
+    def __init__(self, board, face, light, dark, text):
+        self.board, self.face, self.light, self.dark, self.text = board, face, light, dark, text
+
+    @property
+    def pal(self):
+        return self.board.pal
+
+    @pal.setter
+    def pal(self, pal):
+        self.board.pal = pal
+
+    def _paint(self, light, dark, face):
+        cfg = self.board.itemconfigure
+        cfg(self.light, fill=light); cfg(self.dark, fill=dark); cfg(self.face, fill=face)
+
+    def set_raised(self):
+        self._paint(self.pal["edge_light"], self.pal["edge_dark"], self.pal["tile_unrev_bg"])
+
+    def set_pressed(self):
+        self._paint(self.pal["edge_dark"], self.pal["edge_light"], self.pal["tile_rev_bg"])
+
+    def set_revealed_base(self):
+        self._paint(self.pal["tile_rev_bg"], self.pal["tile_rev_bg"], self.pal["tile_rev_bg"])
+
+    def set_hover(self):
+        self.board.itemconfigure(self.face, fill=self.pal["tile_unrev_hover"])
+
+    def set_shade(self, bg):
+        self.board.itemconfigure(self.face, fill=bg)
+
+    def set_text(self, text, fg=None):
+        self.board.itemconfigure(self.text, text=text, fill=(fg or self.pal["tile_fg"]))
+
+    def set_flag(self, fg=None):
+        self.set_raised(); self.set_text(FLAG, (fg or self.pal["flag_fg"]))
+
+    def set_mine(self, fg=None):
+        self.set_revealed_base(); self.set_text(BOMB, (fg or self.pal["mine_fg"]))
+
+class CanvasBoard(tk.Canvas):
+    """
+    Whole board drawn on a single Canvas: four items per cell (face, two bevel
+    polygons, text) and one set of board-level bindings that hit-test the
+    pointer position, instead of a Frame/Label tree and six bindings per Tile.
+    Large boards shrink the tiles to fit the screen and scroll beyond that.
+    """
+
+    BEVEL = 2
+
+    def __init__(self, master, window, rows, cols, pal, size=26, min_size=14):
+        self.rows, self.cols, self.pal, self.window = rows, cols, pal, window
+        avail_w = master.winfo_screenwidth() - 80
+        avail_h = master.winfo_screenheight() - 200
+        size = max(min_size, min(size, avail_w // cols, avail_h // rows))
+        self.size = size
+        width, height = cols * size, rows * size
+        super().__init__(master, width=min(width, avail_w), height=min(height, avail_h),
+                         bg=pal["board_bg"], bd=0, highlightthickness=0,
+                         scrollregion=(0, 0, width, height))
+        if width > avail_w or height > avail_h:
+            self.bind("<Shift-MouseWheel>", lambda e: self.xview_scroll(-1 if e.delta > 0 else 1, "units"))
+            self.bind("<MouseWheel>", lambda e: self.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+            self.bind("<Shift-Button-4>", lambda e: self.xview_scroll(-1, "units"))
+            self.bind("<Shift-Button-5>", lambda e: self.xview_scroll(1, "units"))
+            self.bind("<Button-4>", lambda e: self.yview_scroll(-1, "units"))
+            self.bind("<Button-5>", lambda e: self.yview_scroll(1, "units"))
+        self.configure(xscrollincrement=size, yscrollincrement=size)
+
+        font = ("Helvetica", max(7, size // 2))
+        b = self.BEVEL
+        self.tiles = {}
+        for r in range(rows):
+            y0 = r * size; y1 = y0 + size
+            for c in range(cols):
+                x0 = c * size; x1 = x0 + size
+                face = self.create_rectangle(x0, y0, x1, y1, width=0, fill=pal["tile_unrev_bg"])
+                light = self.create_polygon(x0, y0, x1, y0, x1 - b, y0 + b, x0 + b, y0 + b, x0 + b, y1 - b, x0, y1,
+                                            width=0, fill=pal["edge_light"])
+                dark = self.create_polygon(x1, y1, x0, y1, x0 + b, y1 - b, x1 - b, y1 - b, x1 - b, y0 + b, x1, y0,
+                                           width=0, fill=pal["edge_dark"])
+                text = self.create_text((x0 + x1) // 2, (y0 + y1) // 2, text=" ", font=font, fill=pal["tile_fg"])
+                self.tiles[(r, c)] = CanvasTile(self, face, light, dark, text)
+
+        self._hover = None    # cell under the pointer
+        self._pressed = None  # cell the left button went down on
+        self.bind("<ButtonPress-1>", self._on_press)
+        self.bind("<ButtonRelease-1>", self._on_release)
+        self.bind("<Motion>", self._on_motion)
+        self.bind("<Leave>", self._on_leave)
+        self.bind("<Button-2>", self._on_right)
+        self.bind("<Button-3>", self._on_right)
+
+    def set_palette(self, pal):
+        self.pal = pal
+        self.configure(bg=pal["board_bg"])
+
+    def cell_at(self, event):
+        c = int(self.canvasx(event.x)) // self.size
+        r = int(self.canvasy(event.y)) // self.size
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            return r, c
+        return None
+
+    def _on_motion(self, event):
+        cell = self.cell_at(event)
+        if cell == self._hover: return
+        if self._hover is not None: self.window._leave(*self._hover)
+        self._hover = cell
+        if cell is not None: self.window._hover_on(*cell)
+
+    def _on_leave(self, _event):
+        if self._hover is not None: self.window._leave(*self._hover)
+        self._hover = None
+
+    def _on_press(self, event):
+        self._pressed = self.cell_at(event)
+        if self._pressed is not None: self.window._press(*self._pressed)
+
+    def _on_release(self, _event):
+        # Like a Tile, the release acts on the cell the press started on.
+        cell, self._pressed = self._pressed, None
+        if cell is not None: self.window._release_left(*cell)
+
+    def _on_right(self, event):
+        cell = self.cell_at(event)
+        if cell is not None: self.window._on_right(*cell)
+
 class MinesweeperWindow(tk.Toplevel):
-    def __init__(self, parent, rows, cols, mines, theme='system', colorblind=False, safe_first_click=True):
+    def __init__(self, parent, rows, cols, mines, theme='system', colorblind=False, safe_first_click=True, engine="list",
+                 renderer="tiles", no_guess=False, replay=None):
         super().__init__(parent)
         self.parent = parent
         self.title("Minesweeper")
@@ -386,7 +667,20 @@ class MinesweeperWindow(tk.Toplevel):
         self.theme = theme
         self.colorblind = colorblind
         self.safe_first_click = safe_first_click
-        self._build_ui(); self._apply_theme(); self._new_game()
+        self.engine = engine
+        self.renderer = renderer
+        # No-guess layouts are pre-generated in the background so the first click does not wait.
+        # The chunked engine derives its layout from the seed, so it always plays ordinary boards.
+        self._pool = noguess.NoGuessPool(rows, cols, mines) if no_guess and engine != "chunked" else None
+        self._replay = replay      # movelog.LogData played back at its original pace
+        self._replay_id = None
+        self._replaying = False    # True while a logged move is being played; user input is ignored otherwise
+        if replay is not None: self.title("Minesweeper — replay")
+        try:
+            self._build_ui(); self._apply_theme(); self._new_game()
+        except ValueError:
+            self.destroy()  # the board could not be created; the caller reports why
+            raise
         self.bind_all("<ButtonPress-1>", lambda e: (not (self.game.won or self.game.lost)) and self.face_var.set("😮"))
         self.bind_all("<ButtonRelease-1>", lambda e: (not (self.game.won or self.game.lost)) and self.face_var.set(SMILE))
 
@@ -403,6 +697,32 @@ class MinesweeperWindow(tk.Toplevel):
         bottom = tk.Frame(self, padx=8, pady=8); bottom.pack(fill="x")
         self.back_button = tk.Button(bottom, text="🔙", width=2, command=self._back_to_menu, relief="flat", bd=0, highlightthickness=0)
         self.back_button.pack(side="right")
+        self.hint_button = tk.Button(bottom, text="💡", width=2, command=self._hint, relief="flat", bd=0, highlightthickness=0)
+        self.hint_button.pack(side="left")
+        self.bind("<KeyPress-h>", lambda e: self._hint())
+        self.bind("<KeyPress-H>", lambda e: self._reveal_certain())
+        self.show_probs = False
+        self._probs = {}
+        self.probs_button = tk.Button(bottom, text="%", width=2, command=self._toggle_probs, relief="flat", bd=0, highlightthickness=0)
+        self.probs_button.pack(side="left")
+        self.bind("<KeyPress-p>", lambda e: self._toggle_probs())
+        self.undo_button = tk.Button(bottom, text="↶", width=2, command=self._undo, relief="flat", bd=0, highlightthickness=0)
+        self.undo_button.pack(side="left")
+        self.redo_button = tk.Button(bottom, text="↷", width=2, command=self._redo, relief="flat", bd=0, highlightthickness=0)
+        self.redo_button.pack(side="left")
+        self.bind("<Control-z>", lambda e: self._undo())
+        self.bind("<Control-y>", lambda e: self._redo())
+        self.bind("<Control-Shift-Z>", lambda e: self._redo())
+        self.save_button = tk.Button(bottom, text="💾", width=2, command=self._save_log, relief="flat", bd=0, highlightthickness=0)
+        self.save_button.pack(side="left")
+        self.bind("<Control-s>", lambda e: self._save_log())
+        # Instrumentation overlay: last click-to-paint latency, placed over the board's top-right corner.
+        self.latency_var = tk.StringVar(value="click→paint: no clicks yet")
+        self.latency_label = tk.Label(self, textvariable=self.latency_var, font=("Courier", 10),
+                                      bg="#000000", fg="#00e676", padx=4)
+        self.show_latency = False
+        self.bind("<F12>", lambda e: self._toggle_latency())
+        self.bind("<Shift-F12>", lambda e: self._save_instrumentation())
 
     def _get_theme_palette(self):
         if self.theme == 'dark':
@@ -417,8 +737,12 @@ class MinesweeperWindow(tk.Toplevel):
     def _apply_theme(self):
         pal = self._get_theme_palette()
         self.configure(bg=pal["bg"]); self.board_frame.configure(bg=pal["board_bg"])
-        if hasattr(self, "back_button"):
-            self.back_button.configure(bg=pal["bg"], fg=pal["tile_fg"], activebackground=pal["tile_unrev_hover"], activeforeground=pal["tile_fg"], relief="flat", bd=0, highlightthickness=0)
+        for name in ("back_button", "hint_button", "probs_button", "undo_button", "redo_button", "save_button"):
+            btn = getattr(self, name, None)
+            if btn is not None:
+                btn.configure(bg=pal["bg"], fg=pal["tile_fg"], activebackground=pal["tile_unrev_hover"], activeforeground=pal["tile_fg"], relief="flat", bd=0, highlightthickness=0)
+        if hasattr(self, "canvas"):
+            self.canvas.set_palette(pal)
         if hasattr(self, "tiles"):
             for (r,c), t in self.tiles.items():
                 t.pal = pal
@@ -430,12 +754,66 @@ class MinesweeperWindow(tk.Toplevel):
     def _restart(self): self._new_game()
     def _back_to_menu(self): self.destroy(); self.parent.deiconify()
 
+    def destroy(self):
+        if self._pool is not None: self._pool.close()
+        if self._replay_id: self.after_cancel(self._replay_id)
+        super().destroy()
+
+    @instrument.probe()
     def _new_game(self):
-        for w in self.board_frame.winfo_children(): w.destroy()
+        started = time.perf_counter()
         self.face_var.set(SMILE)
-        self.game = Game(Board(self.rows, self.cols, self.mines, safe_first_click=self.safe_first_click))
+        if self._replay is not None:
+            self.game = Game(self._replay.make_board(self.engine))
+        else:
+            generator = self._pool.take if self._pool is not None else None
+            self.game = Game(make_board(self.rows, self.cols, self.mines, safe_first_click=self.safe_first_click,
+                                        engine=self.engine, generator=generator))
+        shape = (self.rows, self.cols, self.renderer)
+        rebuilt = getattr(self, "_grid_shape", None) != shape
+        if rebuilt:
+            self._build_tiles()
+            self._grid_shape = shape
+        else:
+            # Same dimensions: keep the widgets and bindings, just repaint them unrevealed.
+            for t in self.tiles.values():
+                t.set_raised(); t.set_text(" ")
+        if self.show_probs: self._paint_probs()
+        logger.debug("new %dx%d game (%s, rebuilt=%s) in %.1f ms", self.rows, self.cols, self.renderer,
+                     rebuilt, (time.perf_counter() - started) * 1000)
+        self._update_mines_left(); self._tick()
+        if self._replay is not None:
+            if self._replay_id: self.after_cancel(self._replay_id)
+            # Start shortly after opening rather than after however long the player waited to click.
+            self._replay_id = self.after(500, self._replay_step, 0)
+
+    def _replay_step(self, i):
+        """Play logged move i through the normal handlers, then schedule move i + 1 at its logged time."""
+        moves = self._replay.moves
+        kind, ms, r, c, cells = moves[i]
+        self._replaying = True
+        try:
+            if kind == movelog.REVEAL: self._move(self.game.click, r, c)
+            elif kind == movelog.CHORD: self._move(self.game.chord, r, c)
+            elif kind == movelog.BATCH: self._move(self.game.click_many, cells)
+            elif kind == movelog.FLAG: self._on_right(r, c)
+            elif kind == movelog.UNDO: self._undo()
+            elif kind == movelog.REDO: self._redo()
+        finally:
+            self._replaying = False
+        self._replay_id = None
+        if i + 1 < len(moves) and self.winfo_exists():
+            self._replay_id = self.after(max(0, moves[i + 1][1] - ms), self._replay_step, i + 1)
+
+    def _build_tiles(self):
+        for w in self.board_frame.winfo_children(): w.destroy()
         self.tiles = {}
         pal = self._get_theme_palette()
+        if self.renderer == "canvas":
+            self.canvas = CanvasBoard(self.board_frame, self, self.rows, self.cols, pal)
+            self.canvas.pack()
+            self.tiles = self.canvas.tiles
+            return
         tile_size = 26
         for r in range(self.rows): self.board_frame.rowconfigure(r, minsize=tile_size)
         for c in range(self.cols): self.board_frame.columnconfigure(c, minsize=tile_size)
@@ -451,14 +829,13 @@ class MinesweeperWindow(tk.Toplevel):
                     w.bind("<Button-2>", lambda e, rr=r, cc=c: self._on_right(rr, cc))
                     w.bind("<Button-3>", lambda e, rr=r, cc=c: self._on_right(rr, cc))
                 t.set_raised(); self.tiles[(r,c)] = t
-        self._update_mines_left(); self._tick()
 
+    @instrument.probe()
     def _hover_on(self, r, c):
         cell = self.game.board.grid[r][c]
         if not cell.revealed and not cell.flagged:
-            pal = self._get_theme_palette()
             t = self.tiles.get((r,c))
-            if t: t.center.config(bg=pal["tile_unrev_hover"]); t.label.config(bg=pal["tile_unrev_hover"])
+            if t: t.set_hover()
 
     def _press(self, r, c):
         if self.game.won or self.game.lost: return
@@ -467,43 +844,190 @@ class MinesweeperWindow(tk.Toplevel):
             t = self.tiles.get((r,c)); 
             if t: t.set_pressed()
 
+    @instrument.probe()
     def _leave(self, r, c):
         cell = self.game.board.grid[r][c]
         if not cell.revealed and not cell.flagged:
-            pal = self._get_theme_palette()
             t = self.tiles.get((r,c))
-            if t:
-                t.set_raised()
-                t.center.config(bg=pal["tile_unrev_bg"]); t.label.config(bg=pal["tile_unrev_bg"])
+            if t: t.set_raised()
+            if self.show_probs and (r,c) in self._probs: self._paint_probs([(r,c)])
 
     def _release_left(self, r, c):
         if self.game.won or self.game.lost: return
         self._on_left(r, c)
 
     def _tick(self):
+        # Restarting mid-game must not leave the previous game's timer loop running.
+        if getattr(self, "_tick_id", None): self.after_cancel(self._tick_id)
+        self._tick_id = None
         if self.game.won: self.face_var.set(COOL)
         elif self.game.lost: self.face_var.set(DEAD)
         self.timer_var.set(f"Time: {self.game.elapsed:.2f}s")
-        if not (self.game.won or self.game.lost): self.after(100, self._tick)
+        if not (self.game.won or self.game.lost): self._tick_id = self.after(100, self._tick)
 
     def _update_mines_left(self):
-        flags = sum(1 for r in range(self.rows) for c in range(self.cols) if self.game.board.grid[r][c].flagged)
-        self.mines_left_var.set(f"Mines: {max(0, self.mines - flags)}")
+        self.mines_left_var.set(f"Mines: {self.game.board.mines_left()}")
+
+    def _input_blocked(self):
+        return self._replay is not None and not self._replaying
 
     def _on_left(self, r, c):
+        if self._input_blocked(): return
+        # Clicking a revealed number chords: it opens the other neighbours once all its flags are placed.
+        self._move(self.game.chord if self.game.board.grid[r][c].revealed else self.game.click, r, c)
+
+    def _move(self, action, *args):
+        """Run one game move and repaint everything it changed in a single pass."""
         if self.game.won or self.game.lost: return
-        result = self.game.click(r, c); self._refresh()
+        started = time.perf_counter()
+        result = action(*args); self._refresh(self.game.board.pop_changes())
+        if self.show_probs: self._paint_probs()
+        self._measure_paint(started)
+        self._after_move(result)
+
+    def _measure_paint(self, started):
+        """Record click-to-paint latency: idle callbacks run after the redraws the move queued."""
+        if instrument.enabled: self.after_idle(self._painted, started)
+
+    def _painted(self, started):
+        instrument.record("gui.click_to_paint", time.perf_counter() - started)
+        s = instrument.stat("gui.click_to_paint")
+        self.latency_var.set(f"click→paint {s.last * 1000:.1f} ms  p50 ≤{s.quantile_ms(0.5):g}  "
+                             f"p95 ≤{s.quantile_ms(0.95):g}  n={s.count}")
+
+    def _toggle_latency(self):
+        """Show or hide the click-to-paint overlay; showing it turns instrumentation on."""
+        self.show_latency = not self.show_latency
+        if self.show_latency:
+            instrument.enable()
+            self.latency_label.place(in_=self.board_frame, relx=1.0, rely=0.0, anchor="ne")
+            self.latency_label.lift()
+        else:
+            self.latency_label.place_forget()
+
+    def _save_instrumentation(self):
+        path = filedialog.asksaveasfilename(parent=self, title="Save timings", defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if not path: return
+        try:
+            instrument.save(path)
+        except OSError as e:
+            messagebox.showerror("Save timings", f"Could not save the timings:\n{e}", parent=self)
+
+    def _reveal_certain(self):
+        """Open every cell the solver can prove safe, as one move."""
+        if self._input_blocked() or not self.game.started: return
+        safe, _ = solver.deduce(self.game.board)
+        cells = sorted(rc for rc in safe if not self.game.board.grid[rc[0]][rc[1]].flagged)
+        if cells: self._move(self.game.click_many, cells)
+
+    def _after_move(self, result):
         if result == "mine":
             self._reveal_all(); self.face_var.set(DEAD); messagebox.showinfo("Game Over", "Boom💥!\n You clicked on a mine💣.")
         elif self.game.won:
             self._reveal_all(); self.face_var.set(COOL)
+            elapsed = self.game.elapsed
+            if self._replay is not None:
+                messagebox.showinfo("Replay", f"Board cleared in {self._replay.seconds:.2f} seconds (as logged).")
+                return
+            if self.game.undos:
+                messagebox.showinfo("Congratulations", f"You cleared the board in {elapsed:.2f} seconds!\n"
+                                    "Undo was used, so this time is not recorded.")
+                return
+            board = self.game.board  # file the time under the mines actually played, not the request
             name = simpledialog.askstring("You won!", "Enter your name for highscores:")
-            if name: highscores.submit_score(self.rows, self.cols, self.mines, name, self.game.elapsed)
-            messagebox.showinfo("Congratulations", f"You cleared the board in {self.game.elapsed:.2f} seconds!")
+            ranked = name and highscores.submit_score(board.rows, board.cols, board.mines, name, elapsed)
+            if not ranked:
+                rank, total = highscores.get_rank(board.rows, board.cols, board.mines, elapsed)
+                ranked = (rank, total + 1)  # where this time would place
+            messagebox.showinfo("Congratulations", f"You cleared the board in {elapsed:.2f} seconds!\n"
+                                f"That ranks {highscores.describe_rank(*ranked)} for this board.")
 
     def _on_right(self, r, c):
+        if self.game.won or self.game.lost or self._input_blocked(): return
+        started = time.perf_counter()
+        self.game.flag(r, c); self._update_mines_left(); self._refresh(self.game.board.pop_changes())
+        self._measure_paint(started)
+
+    def _undo(self):
+        if self._input_blocked(): return
+        was_over = self.game.won or self.game.lost
+        if self.game.undo() is None: return
+        # A finished game had every tile revealed by _reveal_all, so repaint them all.
+        self._refresh(None if was_over else self.game.board.pop_changes())
+        if was_over:
+            self.game.board.pop_changes(); self.face_var.set(SMILE); self._tick()
+        if self.show_probs: self._paint_probs()
+        self._update_mines_left()
+
+    def _redo(self):
+        if self.game.won or self.game.lost or self._input_blocked(): return
+        move = self.game.redo()
+        if move is None: return
+        self._refresh(self.game.board.pop_changes())
+        if self.show_probs: self._paint_probs()
+        self._update_mines_left()
+        if move.kind != "flag": self._after_move("mine" if self.game.lost else "ok")
+
+    def _hint(self):
+        """Briefly highlight one cell the solver can prove is safe."""
         if self.game.won or self.game.lost: return
-        self.game.flag(r, c); self._update_mines_left(); self._refresh()
+        if not self.game.started:
+            messagebox.showinfo("Hint", "Nothing to deduce yet — click anywhere to start.")
+            return
+        cell = solver.hint(self.game.board)
+        if cell is None:
+            best = probability.safest_cell(self.game.board)
+            if best is None: return
+            cell, p = best
+            self.tiles[cell].set_pressed()
+            self.after(700, lambda: self._refresh({cell}))
+            messagebox.showinfo("Hint", f"No certain move. The safest guess (highlighted) is a mine with probability {p:.0%}.")
+            return
+        self.tiles[cell].set_pressed()
+        self.after(700, lambda: self._refresh({cell}))
+
+    def _save_log(self):
+        path = filedialog.asksaveasfilename(parent=self, title="Save replay", defaultextension=".mslog",
+                                            filetypes=[("Minesweeper replays", "*.mslog")])
+        if not path: return
+        try:
+            self.game.log.save(path)
+        except OSError as e:
+            messagebox.showerror("Save replay", f"Could not save the replay:\n{e}", parent=self)
+
+    def _toggle_probs(self):
+        """Show or hide the mine-probability heatmap over the unrevealed cells."""
+        self.show_probs = not self.show_probs
+        if self.show_probs: self._paint_probs()
+        else:
+            cells, self._probs = list(self._probs), {}
+            self._refresh(cells)
+
+    def _prob_color(self, p):
+        # blend the unrevealed face towards red as the mine probability rises
+        base = self._get_theme_palette()["tile_unrev_bg"]
+        r0, g0, b0 = (int(base[i:i + 2], 16) for i in (1, 3, 5))
+        r1, g1, b1 = (0x00, 0x42, 0x9d) if self.colorblind else (0xd3, 0x2f, 0x2f)
+        mix = lambda a, b: round(a + (b - a) * p)
+        return f"#{mix(r0, r1):02x}{mix(g0, g1):02x}{mix(b0, b1):02x}"
+
+    @instrument.probe()
+    def _paint_probs(self, cells=None):
+        """Shade unrevealed, unflagged cells by mine probability; recomputes when cells is None."""
+        if self.game.won or self.game.lost: return
+        if cells is None:
+            started = time.perf_counter()
+            self._probs = probability.mine_probabilities(self.game.board)
+            logger.debug("mine probabilities in %.1f ms", (time.perf_counter() - started) * 1000)
+            cells = self._probs
+        pal = self._get_theme_palette()
+        for rc in cells:
+            p = self._probs[rc]
+            cell, t = self.game.board.grid[rc[0]][rc[1]], self.tiles[rc]
+            if cell.flagged or cell.revealed: continue
+            t.set_shade(self._prob_color(p))
+            t.set_text(f"{round(p * 100)}", pal["tile_fg"])
 
     def _num_color(self, n):
         if getattr(self, "colorblind", False):
@@ -512,9 +1036,12 @@ class MinesweeperWindow(tk.Toplevel):
             palette = {1:"#1976d2",2:"#388e3c",3:"#d32f2f",4:"#7b1fa2",5:"#5d4037",6:"#00838f",7:"#000000",8:"#616161"}
         return palette.get(n, "#000000")
 
-    def _refresh(self):
+    @instrument.probe()
+    def _refresh(self, cells=None):
+        """Repaint the given (r, c) cells, or every tile when cells is None."""
         pal = self._get_theme_palette()
-        for (r,c), t in self.tiles.items():
+        tiles = self.tiles.items() if cells is None else ((rc, self.tiles[rc]) for rc in cells)
+        for (r,c), t in tiles:
             cell = self.game.board.grid[r][c]
             if cell.revealed:
                 t.set_revealed_base()
@@ -526,6 +1053,8 @@ class MinesweeperWindow(tk.Toplevel):
                 if cell.flagged: t.set_flag(pal["flag_fg"])
                 else:
                     t.set_raised(); t.set_text(" ", pal["tile_fg"])
+        if self.show_probs and cells is not None:
+            self._paint_probs([rc for rc in cells if rc in self._probs])
 
     def _reveal_all(self):
         pal = self._get_theme_palette()
@@ -1,37 +1,250 @@
-
 from __future__ import annotations
-import json, time, os
-from typing import Dict
+import json, math, time, os, sys, logging
+from bisect import bisect_left, bisect_right
+from contextlib import closing
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    import sqlite3  # annotations only; SqliteStore imports it when used
+
+logger = logging.getLogger(__name__)
 
 FILE = os.path.join(os.path.expanduser("~"), ".minesweeper_highscores.json")
+DB_FILE = os.path.join(os.path.expanduser("~"), ".minesweeper_highscores.sqlite3")
 
-def _load() -> Dict:
-    if not os.path.exists(FILE):
-        return {}
+def _key(rows: int, cols: int, mines: int) -> str:
+    return f"{rows}x{cols}:{mines}"
+
+def _entry(name: str, elapsed: float) -> Dict:
+    return {"name": name.strip()[:32] or "anon", "time": float(elapsed), "when": time.strftime("%Y-%m-%d")}
+
+
+class JsonStore:
+    """
+    The original storage: one JSON file with every result per configuration,
+    kept sorted by time so ranks are a bisect rather than a sort.
+    """
+
+    def __init__(self, path: str = FILE):
+        self.path = path
+
+    def _load(self) -> Dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("could not read high scores from %s: %s", self.path, e)
+            return {}
+
+    def _save(self, data: Dict) -> None:
+        # Write to a temp file and rename over the original so readers never see a partial file.
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("could not save high scores to %s: %s", self.path, e)
+
+    def submit(self, key: str, entry: Dict) -> Tuple[int, int]:
+        data = self._load()
+        scores = data.setdefault(key, [])
+        scores.insert(bisect_right([s["time"] for s in scores], entry["time"]), entry)
+        self._save(data)
+        return self._rank(scores, entry["time"])
+
+    def top10(self, key: str) -> List[Dict]:
+        return self._load().get(key, [])[:10]
+
+    def rank(self, key: str, elapsed: float) -> Tuple[int, int]:
+        return self._rank(self._load().get(key, []), elapsed)
+
+    def time_at(self, key: str, index: int) -> float | None:
+        scores = self._load().get(key, [])
+        return scores[index]["time"] if 0 <= index < len(scores) else None
+
+    @staticmethod
+    def _rank(scores: List[Dict], elapsed: float) -> Tuple[int, int]:
+        return bisect_left([s["time"] for s in scores], float(elapsed)) + 1, len(scores)
+
+
+class SqliteStore:
+    """
+    High scores in an SQLite database (WAL mode) with an index on
+    (key, time), so submits are single-row transactions that are safe across
+    processes and top-10 is an index range scan. Every result is kept.
+
+    Rank and percentile lookups do not count or skip rows across the whole
+    table: `buckets` keeps per-key counts by whole second, updated with each
+    insert, so a lookup sums the bucket counts and only walks the scores of
+    the one bucket the time falls in. The cost follows the number of distinct
+    seconds and the fullest second, not the number of results.
+
+    On first use, scores from the legacy JSON file are imported once.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scores (
+            id   INTEGER PRIMARY KEY,
+            key  TEXT NOT NULL,
+            name TEXT NOT NULL,
+            time REAL NOT NULL,
+            day  TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS scores_key_time ON scores (key, time);
+        CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS counts (key TEXT PRIMARY KEY, n INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS buckets (
+            key    TEXT NOT NULL,
+            bucket INTEGER NOT NULL,   -- whole seconds of time
+            n      INTEGER NOT NULL,
+            PRIMARY KEY (key, bucket)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: str = DB_FILE, legacy_json: str | None = FILE):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+            if legacy_json:
+                self._migrate(conn, legacy_json)
+            with conn:  # per-key totals and buckets, rebuilt for databases that predate those tables
+                conn.execute("BEGIN IMMEDIATE")
+                if not conn.execute("SELECT 1 FROM counts LIMIT 1").fetchone():
+                    conn.execute("INSERT INTO counts (key, n) SELECT key, COUNT(*) FROM scores GROUP BY key")
+                if not conn.execute("SELECT 1 FROM buckets LIMIT 1").fetchone():
+                    conn.execute("INSERT INTO buckets (key, bucket, n) SELECT key, CAST(time AS INTEGER), COUNT(*) "
+                                 "FROM scores GROUP BY 1, 2")
+
+    def _connect(self) -> sqlite3.Connection:
+        # A short-lived connection per call keeps the store usable from any thread or process.
+        import sqlite3  # only this store needs it; a JSON-only setup never loads it
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _migrate(self, conn: sqlite3.Connection, legacy_json: str) -> None:
+        with conn:  # one transaction: either everything is imported and marked, or nothing
+            # Take the write lock before checking, so two processes opening a new
+            # store at once cannot both see it unmigrated and import twice.
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM meta WHERE name = 'json_migrated'").fetchone():
+                return
+            data = JsonStore(legacy_json)._load() if os.path.exists(legacy_json) else {}
+            rows = [(k, s["name"], float(s["time"]), s.get("when", ""))
+                    for k, scores in data.items() for s in scores]
+            conn.executemany("INSERT INTO scores (key, name, time, day) VALUES (?, ?, ?, ?)", rows)
+            conn.execute("INSERT INTO meta (name, value) VALUES ('json_migrated', ?)", (legacy_json,))
+        if rows:
+            logger.info("imported %d high scores from %s", len(rows), legacy_json)
+
+    def submit(self, key: str, entry: Dict) -> Tuple[int, int]:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT INTO scores (key, name, time, day) VALUES (?, ?, ?, ?)",
+                         (key, entry["name"], entry["time"], entry["when"]))
+            conn.execute("INSERT OR IGNORE INTO counts (key, n) VALUES (?, 0)", (key,))
+            conn.execute("UPDATE counts SET n = n + 1 WHERE key = ?", (key,))
+            bucket = int(entry["time"])
+            conn.execute("INSERT OR IGNORE INTO buckets (key, bucket, n) VALUES (?, ?, 0)", (key, bucket))
+            conn.execute("UPDATE buckets SET n = n + 1 WHERE key = ? AND bucket = ?", (key, bucket))
+            return self._rank(conn, key, entry["time"])
+
+    def rank(self, key: str, elapsed: float) -> Tuple[int, int]:
+        with closing(self._connect()) as conn:
+            return self._rank(conn, key, elapsed)
+
+    def time_at(self, key: str, index: int) -> float | None:
+        if index < 0: return None
+        with closing(self._connect()) as conn:
+            # find the bucket holding the index-th time, then step only over that bucket's scores
+            for bucket, n in conn.execute("SELECT bucket, n FROM buckets WHERE key = ? ORDER BY bucket", (key,)):
+                if index < n:
+                    row = conn.execute("SELECT time FROM scores WHERE key = ? AND time >= ? ORDER BY time "
+                                       "LIMIT 1 OFFSET ?", (key, bucket, index)).fetchone()
+                    return row[0] if row else None
+                index -= n
+            return None
+
+    @staticmethod
+    def _rank(conn: sqlite3.Connection, key: str, elapsed: float) -> Tuple[int, int]:
+        elapsed = float(elapsed)
+        bucket = int(elapsed) if math.isfinite(elapsed) else 2**62   # inf: every bucket is below
+        better, total = conn.execute(
+            """SELECT (SELECT COALESCE(SUM(n), 0) FROM buckets WHERE key = ? AND bucket < ?)
+                    + (SELECT COUNT(*) FROM scores WHERE key = ? AND time >= ? AND time < ?),
+                      (SELECT COALESCE(MAX(n), 0) FROM counts WHERE key = ?)""",
+            (key, bucket, key, bucket, elapsed, key)).fetchone()
+        return better + 1, total
+
+    def top10(self, key: str) -> List[Dict]:
+        with closing(self._connect()) as conn:
+            cur = conn.execute("SELECT name, time, day FROM scores WHERE key = ? ORDER BY time, id LIMIT 10", (key,))
+            return [{"name": n, "time": t, "when": d} for n, t, d in cur]
+
+
+_backend = None
+
+def _db_errors() -> tuple:
+    """sqlite3.Error once SqliteStore has loaded sqlite3; before that no store can raise it."""
+    sqlite3 = sys.modules.get("sqlite3")
+    return (sqlite3.Error,) if sqlite3 is not None else ()
+
+def set_backend(store) -> None:
+    """Use `store` (a JsonStore, SqliteStore or anything with submit/top10) for all calls."""
+    global _backend
+    _backend = store
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        try:
+            _backend = SqliteStore()
+        except (ImportError, *_db_errors()) as e:
+            logger.warning("SQLite high score store unavailable (%s); using %s", e, FILE)
+            _backend = JsonStore()
+    return _backend
+
+def submit_score(rows: int, cols: int, mines: int, name: str, elapsed: float) -> Tuple[int, int] | None:
+    """Store a result; returns its (rank, total) for the configuration, or None if saving failed."""
     try:
-        with open(FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
+        return get_backend().submit(_key(rows, cols, mines), _entry(name, elapsed))
+    except _db_errors() as e:
+        logger.warning("could not save high score: %s", e)
+        return None
 
-def _save(data: Dict) -> None:
+def get_rank(rows: int, cols: int, mines: int, elapsed: float) -> Tuple[int, int]:
+    """
+    (rank, total) that `elapsed` has / would have among stored results; rank
+    1 is fastest and ties share the better rank. `total` counts stored
+    results only, so add one for a time that has not been submitted.
+    """
     try:
-        with open(FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-    except Exception:
-        pass
+        return get_backend().rank(_key(rows, cols, mines), elapsed)
+    except _db_errors() as e:
+        logger.warning("could not read high scores: %s", e)
+        return 1, 0
 
-def _key(rows: int, cols: int, mines: int) -> str:
-    return f"{rows}x{cols}:{mines}"
+def get_percentiles(rows: int, cols: int, mines: int, percents=(10, 50, 90)) -> Dict[int, float]:
+    """Time needed to reach each percentile (10 = faster than 90% of results), e.g. {50: median}."""
+    store, key = get_backend(), _key(rows, cols, mines)
+    try:
+        _, total = store.rank(key, float("inf"))
+        if total == 0:
+            return {}
+        return {p: store.time_at(key, min(total - 1, int(total * p / 100))) for p in percents}
+    except _db_errors() as e:
+        logger.warning("could not read high scores: %s", e)
+        return {}
 
-def submit_score(rows: int, cols: int, mines: int, name: str, elapsed: float) -> None:
-    data = _load()
-    k = _key(rows, cols, mines)
-    data.setdefault(k, [])
-    data[k].append({"name": name.strip()[:32] or "anon", "time": float(elapsed), "when": time.strftime("%Y-%m-%d")})
-    data[k] = sorted(data[k], key=lambda s: s["time"])[:10]
-    _save(data)
+def describe_rank(rank: int, total: int) -> str:
+    """e.g. '87th of 4,000 (top 2.2%)'."""
+    suffix = "th" if 10 <= rank % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(rank % 10, "th")
+    return f"{rank:,}{suffix} of {total:,} (top {100 * rank / total:.1f}%)"
 
 def get_top10(rows: int, cols: int, mines: int):
-    data = _load()
-    return data.get(_key(rows, cols, mines), [])
+    try:
+        return get_backend().top10(_key(rows, cols, mines))
+    except _db_errors() as e:
+        logger.warning("could not read high scores: %s", e)
+        return []
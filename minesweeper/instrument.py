@@ -0,0 +1,188 @@
+"""
+instrument.py — opt-in counters and latency histograms.
+
+Methods marked with `@probe` are left untouched while instrumentation is
+off: the decorator only registers them, so a disabled build pays nothing
+per call. `enable()` swaps every registered method for a timing wrapper on
+its class and `disable()` puts the originals back. Each probe keeps a call
+count, total and maximum time, a log-spaced latency histogram and,
+optionally, a size per call (e.g. cells opened by a reveal). `record()`
+adds a timing taken elsewhere, such as the GUI's click-to-paint latency.
+
+`snapshot()` is a JSON-ready dict of everything recorded so far, meant to be
+attached to bug reports:
+
+    MINESWEEPER_INSTRUMENT=~/minesweeper-timings.json python main.py
+
+enables instrumentation at startup and writes the snapshot there on exit.
+In the game window, F12 toggles a click-to-paint overlay (and enables
+instrumentation) and Shift+F12 saves a snapshot.
+"""
+
+from __future__ import annotations
+import functools
+import json
+import platform
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple
+
+# Histogram bucket upper bounds in milliseconds; the last bucket holds everything slower.
+BOUNDS_MS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+enabled = False
+_lock = threading.Lock()
+_probes: List[Tuple[Callable, str, Callable | None]] = []   # (function, name, size)
+_patched: Dict[Callable, Callable] = {}                     # original function -> its timing wrapper
+_stats: Dict[str, "Stat"] = {}
+_since = time.time()
+
+
+class Stat:
+    """Calls, time and (optionally) sizes recorded for one probe."""
+
+    __slots__ = ("count", "total", "max", "last", "buckets", "size_total", "size_max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = self.max = self.last = 0.0
+        self.buckets = [0] * (len(BOUNDS_MS) + 1)
+        self.size_total = self.size_max = 0
+
+    def add(self, seconds: float, size: int | None = None) -> None:
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max: self.max = seconds
+        self.buckets[bisect_left(BOUNDS_MS, seconds * 1000)] += 1
+        if size is not None:
+            self.size_total += size
+            if size > self.size_max: self.size_max = size
+
+    def quantile_ms(self, q: float) -> float:
+        """Upper bound of the bucket holding quantile q (the maximum for the overflow bucket)."""
+        target, seen = q * self.count, 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return BOUNDS_MS[i] if i < len(BOUNDS_MS) else self.max * 1000
+        return 0.0
+
+    def to_dict(self) -> dict:
+        out = {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 4) if self.count else None,
+            "max_ms": round(self.max * 1000, 4),
+            "p50_ms": self.quantile_ms(0.5),
+            "p95_ms": self.quantile_ms(0.95),
+            "histogram_ms": {f"<={b}": n for b, n in zip(BOUNDS_MS, self.buckets)},
+        }
+        out["histogram_ms"][f">{BOUNDS_MS[-1]}"] = self.buckets[-1]
+        if self.size_total or self.size_max:
+            out["size_total"], out["size_max"] = self.size_total, self.size_max
+        return out
+
+
+def probe(name: str | None = None, size: Callable | None = None):
+    """
+    Register a method for timing once instrumentation is enabled; the method
+    itself is returned unchanged (unless instrumentation is already on when
+    its module is imported). `name` defaults to "Class.method";
+    `size(self, result)` gives a per-call size such as cells opened.
+    """
+    def register(func):
+        _probes.append((func, name or func.__qualname__, size))
+        if enabled:  # a module imported after enable(), e.g. npboard via make_board
+            with _lock:
+                _patched[func] = _wrap(func, name or func.__qualname__, size)
+                return _patched[func]
+        return func
+    return register
+
+
+def record(name: str, seconds: float, size: int | None = None) -> None:
+    """Add one timing to `name` (ignored while disabled)."""
+    if not enabled: return
+    with _lock:
+        stat = _stats.get(name)
+        if stat is None:
+            stat = _stats[name] = Stat()
+        stat.add(seconds, size)
+
+
+def stat(name: str) -> Stat | None:
+    return _stats.get(name)
+
+
+def _owner(func) -> Tuple[object, str]:
+    """(class, attribute) a registered method lives under, from its module and qualified name."""
+    owner = sys.modules.get(func.__module__)
+    *path, attr = func.__qualname__.split(".")
+    for part in path:
+        owner = getattr(owner, part, None)
+    return owner, attr
+
+
+def _wrap(func, name, size):
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        t0 = time.perf_counter()
+        result = func(*args, **kwargs)
+        record(name, time.perf_counter() - t0, size(args[0], result) if size else None)
+        return result
+    return timed
+
+
+def enable() -> None:
+    """Start recording: wrap every registered method (including ones registered since the last call)."""
+    global enabled
+    with _lock:
+        for func, name, size in _probes:
+            if func in _patched: continue
+            owner, attr = _owner(func)
+            if owner is None or getattr(owner, attr, None) is not func: continue
+            _patched[func] = _wrap(func, name, size)
+            setattr(owner, attr, _patched[func])
+        enabled = True
+
+
+def disable() -> None:
+    """Stop recording and restore the original methods; recorded data is kept."""
+    global enabled
+    with _lock:
+        for func, timed in _patched.items():
+            owner, attr = _owner(func)
+            if getattr(owner, attr, None) is timed:
+                setattr(owner, attr, func)
+        _patched.clear()
+        enabled = False
+
+
+def reset() -> None:
+    """Drop everything recorded so far."""
+    global _since
+    with _lock:
+        _stats.clear()
+        _since = time.time()
+
+
+def snapshot() -> dict:
+    """JSON-ready copy of all probes, with enough context to read it on another machine."""
+    with _lock:
+        probes = {name: s.to_dict() for name, s in sorted(_stats.items())}
+    return {
+        "enabled": enabled,
+        "since": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(_since)),
+        "taken": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "probes": probes,
+    }
+
+
+def save(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, indent=2)
@@ -1,6 +1,41 @@
+import time
 
+_STARTED_AT = time.perf_counter()  # before the GUI imports, so they count toward startup time
+
+import argparse
+import json
+import logging
+import os
+
+import instrument
 from gui import Launcher
 
 if __name__ == "__main__":
-    app = Launcher()
+    parser = argparse.ArgumentParser(description="Minesweeper")
+    parser.add_argument("--no-splash", action="store_true", default=bool(os.environ.get("MINESWEEPER_NO_SPLASH")),
+                        help="skip the splash animation (or set MINESWEEPER_NO_SPLASH=1)")
+    parser.add_argument("--measure-startup", action="store_true",
+                        help="print the time to an interactive menu as JSON and exit (implies --no-splash unless given)")
+    parser.add_argument("--with-splash", action="store_true", help="keep the splash with --measure-startup")
+    parser.add_argument("--instrument", metavar="PATH", default=os.environ.get("MINESWEEPER_INSTRUMENT"),
+                        help="record operation timings and write them to PATH as JSON on exit "
+                             "(or set MINESWEEPER_INSTRUMENT=PATH)")
+    args = parser.parse_args()
+    if args.instrument:
+        instrument.enable()
+
+    # e.g. MINESWEEPER_LOGLEVEL=DEBUG dumps every board layout
+    logging.basicConfig(level=os.environ.get("MINESWEEPER_LOGLEVEL", "WARNING").upper())
+
+    on_interactive = None
+    skip_splash = args.no_splash
+    if args.measure_startup:
+        skip_splash = not args.with_splash
+        def on_interactive(seconds):
+            print(json.dumps({"time_to_interactive_ms": round(seconds * 1000, 1), "splash": not skip_splash}))
+            app.destroy()
+
+    app = Launcher(skip_splash=skip_splash, started_at=_STARTED_AT, on_interactive=on_interactive)
     app.mainloop()
+    if args.instrument:
+        instrument.save(os.path.expanduser(args.instrument))
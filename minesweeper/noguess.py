@@ -0,0 +1,233 @@
+"""
+noguess.py — layouts that can be cleared from the first click without guessing.
+
+`generate` draws mines away from the first click and its neighbours (so the
+click opens an area), then plays the layout with the solver. When the solver
+gets stuck it repairs the layout instead of starting over: one mine from the
+stuck frontier moves to a random cell that nothing revealed touches, and the
+layout is played again. A layout that needs too many repairs is dropped and a
+fresh one is drawn.
+
+`NoGuessPool` keeps a few finished layouts ready on a background thread, so a
+first click on Expert usually does not wait for generation (see `take`).
+
+Throughput and first-click latency can be measured headless:
+
+    python -m noguess --difficulty expert --count 200 --seed 1
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import logging
+import random
+import statistics
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from config import EASY, INTERMEDIATE, EXPERT
+from board import neighbor_table, sample_mine_positions
+from solver import REVEALED, UNKNOWN, play_layout, solve_layout
+
+logger = logging.getLogger(__name__)
+
+
+def _numbers(is_mine: bytearray, nbrs) -> List[int]:
+    """Flat layout for the solver: -1 for mines, else the adjacent mine count."""
+    return [-1 if m else sum(is_mine[j] for j in nb) for m, nb in zip(is_mine, nbrs)]
+
+
+def generate(rows: int, cols: int, mines: int, rng: random.Random, start: int,
+             max_repairs: int | None = None, max_layouts: int = 200) -> List[int]:
+    """
+    Flat mine indices of a layout the solver clears from flat cell `start`.
+
+    Needs at least one safe cell besides the opening; on very dense boards
+    where no solvable layout turns up within `max_layouts` draws, the layout
+    that got furthest is returned (with a warning) rather than looping forever.
+    """
+    area = rows * cols
+    nbrs = neighbor_table(rows, cols)
+    clear = {start, *nbrs[start]} if area - mines > len(nbrs[start]) + 1 else {start}
+    exclude = {divmod(i, cols) for i in clear}
+    if max_repairs is None:
+        max_repairs = 2 * mines
+    best, best_open = None, -1
+
+    for _ in range(max_layouts):
+        is_mine = bytearray(area)
+        for i in sample_mine_positions(rows, cols, mines, rng, exclude):
+            is_mine[i] = 1
+        for _ in range(max_repairs + 1):
+            f = play_layout(_numbers(is_mine, nbrs), rows, cols, mines, start)
+            opened = f.state.count(REVEALED)
+            if opened == area - mines:
+                return [i for i in range(area) if is_mine[i]]
+            if opened > best_open:
+                best, best_open = bytes(is_mine), opened
+            stuck = [j for j in f.watch if is_mine[j]]
+            free = [j for j, st in enumerate(f.state)
+                    if st == UNKNOWN and not is_mine[j] and j not in f.watch and j not in clear]
+            if not stuck or not free:
+                break  # nothing to move: draw a fresh layout
+            is_mine[rng.choice(stuck)] = 0
+            is_mine[rng.choice(free)] = 1
+
+    logger.warning("no no-guess %dx%d:%d layout found in %d draws; using the best one (%d of %d safe cells)",
+                   rows, cols, mines, max_layouts, best_open, area - mines)
+    return [i for i in range(area) if best[i]]
+
+
+def _symmetries(rows: int, cols: int):
+    """Index maps for the identity, both mirrors and the half turn of a rows x cols board."""
+    flip_r = lambda i: (rows - 1 - i // cols) * cols + i % cols
+    flip_c = lambda i: (i // cols) * cols + cols - 1 - i % cols
+    return (lambda i: i, flip_r, flip_c, lambda i: flip_r(flip_c(i)))
+
+
+class NoGuessPool:
+    """
+    Background supply of no-guess layouts for one board size.
+
+    A layout generated for one start cell also works for any zero cell of the
+    area that start opens (clicking there opens the same area), for the zero
+    areas it is also solvable from, and for the mirrored positions of those
+    cells. `take(r, c)` hands out a pooled layout
+    whose opening covers the click and only generates on the spot on a miss;
+    the thread then refills the pool. Pass `pool.take` as a board's
+    `generator`.
+    """
+
+    def __init__(self, rows: int, cols: int, mines: int, size: int = 12, rng: random.Random | int | None = None):
+        self.rows, self.cols, self.mines, self.size = rows, cols, mines, size
+        self.rng = rng if isinstance(rng, random.Random) else random.Random(rng)
+        self._ready: List[Tuple[List[int], Dict[int, int]]] = []   # (mines, {click cell: symmetry index})
+        self._cond = threading.Condition()
+        self._stopped = False
+        self.hits = self.misses = 0
+        self._thread = threading.Thread(target=self._fill, name="noguess-pool", daemon=True)
+        self._thread.start()
+
+    def _make(self) -> Tuple[List[int], Dict[int, int]]:
+        rows, cols, area = self.rows, self.cols, self.rows * self.cols
+        nbrs = neighbor_table(rows, cols)
+        with self._cond:
+            start = self.rng.randrange(area)
+            seed = self.rng.getrandbits(64)
+        positions = generate(rows, cols, self.mines, random.Random(seed), start)
+        is_mine = bytearray(area)
+        for i in positions: is_mine[i] = 1
+        numbers = _numbers(is_mine, nbrs)
+        # Clicking any zero cell opens its whole zero area, so a zero area the layout is
+        # solvable from is valid for all of its cells (the start's area always is).
+        zeros, seen = set(), set()
+        for i in range(area):
+            if numbers[i] != 0 or i in seen: continue
+            region, stack = {i}, [i]
+            while stack:
+                for j in nbrs[stack.pop()]:
+                    if numbers[j] == 0 and j not in region:
+                        region.add(j); stack.append(j)
+            seen |= region
+            if start in region or solve_layout(numbers, rows, cols, self.mines, i) == area - self.mines:
+                zeros |= region
+        covers = {}
+        for s, sym in enumerate(_symmetries(rows, cols)):
+            for i in zeros:
+                covers.setdefault(sym(i), s)
+        return positions, covers
+
+    def _fill(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped and len(self._ready) >= self.size:
+                    self._cond.wait()
+                if self._stopped: return
+            item = self._make()
+            with self._cond:
+                self._ready.append(item)
+
+    def take(self, rows: int, cols: int, mines: int, rng: random.Random, start: int) -> List[int]:
+        """Board generator hook: a pooled layout covering `start`, else a freshly generated one."""
+        if (rows, cols, mines) != (self.rows, self.cols, self.mines):
+            return generate(rows, cols, mines, rng, start)
+        with self._cond:
+            for k, (positions, covers) in enumerate(self._ready):
+                if start in covers:
+                    del self._ready[k]
+                    self._cond.notify()
+                    self.hits += 1
+                    sym = _symmetries(rows, cols)[covers[start]]
+                    return [sym(i) for i in positions]  # the mirrors are their own inverses
+            self.misses += 1
+        return generate(rows, cols, mines, rng, start)
+
+    def close(self) -> None:
+        """Stop the refill thread (a layout being generated is finished first)."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+
+DIFFICULTIES = {"easy": EASY, "intermediate": INTERMEDIATE, "expert": EXPERT}
+
+
+def measure(rows: int, cols: int, mines: int, count: int, seed: int | None = None, pool_size: int = 12) -> dict:
+    """
+    Time `generate` for `count` random first clicks, then `count` first clicks
+    served by a NoGuessPool that is refilled between games.
+    """
+    rng = random.Random(seed)
+    times = []
+    for _ in range(count):
+        start = rng.randrange(rows * cols)
+        t0 = time.perf_counter()
+        generate(rows, cols, mines, rng, start)
+        times.append(time.perf_counter() - t0)
+
+    pool = NoGuessPool(rows, cols, mines, size=pool_size, rng=rng.getrandbits(64))
+    latency = []
+    try:
+        for _ in range(count):
+            while len(pool._ready) < pool.size:  # a real game takes long enough to refill the pool
+                time.sleep(0.005)
+            start = rng.randrange(rows * cols)
+            t0 = time.perf_counter()
+            pool.take(rows, cols, mines, rng, start)
+            latency.append(time.perf_counter() - t0)
+    finally:
+        pool.close()
+
+    ms = lambda xs, q: round(sorted(xs)[min(len(xs) - 1, int(q * len(xs)))] * 1000, 3)
+    return {
+        "rows": rows, "cols": cols, "mines": mines, "count": count, "seed": seed,
+        "boards_per_second": round(count / sum(times), 1),
+        "generate_ms": {"median": round(statistics.median(times) * 1000, 3), "p90": ms(times, 0.9), "max": ms(times, 1.0)},
+        "pool_size": pool_size,
+        "pool_hit_rate": round(pool.hits / count, 3),
+        "first_click_ms": {"median": round(statistics.median(latency) * 1000, 3), "p90": ms(latency, 0.9),
+                           "max": ms(latency, 1.0)},
+    }
+
+
+def main(argv=None):
+    """Headless entry point; see the module docstring for an example."""
+    p = argparse.ArgumentParser(prog="python -m noguess", description="Measure no-guess board generation.")
+    p.add_argument("--difficulty", choices=sorted(DIFFICULTIES), default="expert")
+    p.add_argument("--count", type=int, default=100, help="number of boards (default: 100)")
+    p.add_argument("--seed", type=int)
+    p.add_argument("--pool-size", type=int, default=12)
+    args = p.parse_args(argv)
+    if args.count < 1:
+        p.error("--count must be positive")
+    diff = DIFFICULTIES[args.difficulty]
+    json.dump(measure(diff.rows, diff.cols, diff.mines, args.count, seed=args.seed, pool_size=args.pool_size),
+              sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+npboard.py — NumPy-backed board engine.
+
+`NumpyBoard` keeps the board as a handful of compact arrays instead of one
+`Cell` object per square, and computes the adjacency numbers with a single
+vectorized 3x3 sum. It exposes the same API as `board.Board` (`reveal`,
+`toggle_flag`, `count_revealed`, `grid[r][c]`, ...) so `Game` and the GUI can
+use either engine. Select it with `board.make_board(..., engine="numpy")`.
+"""
+
+from __future__ import annotations
+from typing import Iterable, List, Set, Tuple
+import random
+
+import numpy as np
+
+import instrument
+from board import BoardSnapshot, LayoutGenerator, make_rng, sample_mine_positions, log_layout
+
+# 3x3 neighborhood offsets, excluding the center
+_DR = np.array([-1, -1, -1, 0, 0, 1, 1, 1])
+_DC = np.array([-1, 0, 1, -1, 1, -1, 0, 1])
+
+
+class _CellView:
+    """Read-only stand-in for `board.Cell` backed by the board arrays."""
+
+    __slots__ = ("_b", "_r", "_c")
+
+    def __init__(self, board: "NumpyBoard", r: int, c: int):
+        self._b, self._r, self._c = board, r, c
+
+    @property
+    def mine(self) -> bool:
+        return bool(self._b.mine[self._r, self._c])
+
+    @property
+    def number(self) -> int:
+        if self._b.mine[self._r, self._c]:
+            return -1
+        return int(self._b.number[self._r, self._c])
+
+    @property
+    def revealed(self) -> bool:
+        return bool(self._b.revealed[self._r, self._c])
+
+    @property
+    def flagged(self) -> bool:
+        return bool(self._b.flagged[self._r, self._c])
+
+
+class _RowView:
+    __slots__ = ("_b", "_r")
+
+    def __init__(self, board: "NumpyBoard", r: int):
+        self._b, self._r = board, r
+
+    def __len__(self) -> int:
+        return self._b.cols
+
+    def __getitem__(self, c: int) -> _CellView:
+        return _CellView(self._b, self._r, c)
+
+    def __iter__(self):
+        return (_CellView(self._b, self._r, c) for c in range(self._b.cols))
+
+
+class _GridView:
+    """Lets `board.grid[r][c].revealed` style code work on a `NumpyBoard`."""
+
+    __slots__ = ("_b",)
+
+    def __init__(self, board: "NumpyBoard"):
+        self._b = board
+
+    def __len__(self) -> int:
+        return self._b.rows
+
+    def __getitem__(self, r: int) -> _RowView:
+        return _RowView(self._b, r)
+
+    def __iter__(self):
+        return (_RowView(self._b, r) for r in range(self._b.rows))
+
+
+def neighbor_counts(mine: np.ndarray) -> np.ndarray:
+    """Number of mines in the 8-neighborhood of every cell (uint8)."""
+    rows, cols = mine.shape[-2:]
+    padded = np.pad(mine.astype(np.uint8), [(0, 0)] * (mine.ndim - 2) + [(1, 1), (1, 1)])
+    counts = np.zeros(mine.shape, dtype=np.uint8)
+    for dr in range(3):
+        for dc in range(3):
+            if dr == 1 and dc == 1:
+                continue
+            counts += padded[..., dr:dr + rows, dc:dc + cols]
+    return counts
+
+
+class NumpyBoard:
+    def __init__(self, rows: int, cols: int, mines: int, safe_first_click: bool = True,
+                 rng: random.Random | int | None = None, check_invariants: bool = False,
+                 generator: LayoutGenerator | None = None):
+        assert rows > 0 and cols > 0
+        assert 0 < mines < rows * cols
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.mine = np.zeros((rows, cols), dtype=bool)
+        self.number = np.zeros((rows, cols), dtype=np.uint8)
+        self.revealed = np.zeros((rows, cols), dtype=bool)
+        self.flagged = np.zeros((rows, cols), dtype=bool)
+        self.grid = _GridView(self)
+        self.safe_first_click = safe_first_click
+        self._mines_placed = False
+        self.rng, self.seed = make_rng(rng)
+        self.revealed_safe = 0
+        self.flags = 0
+        self.check_invariants = check_invariants
+        self._changed: Set[Tuple[int,int]] = set()
+        self.last_opened: List[Tuple[int,int]] = []
+        self.generator = generator
+
+    def neighbors(self, r: int, c: int) -> Iterable[Tuple[int,int]]:
+        for dr in (-1,0,1):
+            for dc in (-1,0,1):
+                if dr == 0 and dc == 0: continue
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                    yield nr, nc
+
+    @instrument.probe()
+    def _place_mines(self, exclude: Set[Tuple[int,int]] | None = None, positions: List[int] | None = None) -> None:
+        if positions is None:
+            positions = sample_mine_positions(self.rows, self.cols, self.mines, self.rng, exclude)
+        self.mine[:] = False
+        self.mine.flat[positions] = True
+        self.number = neighbor_counts(self.mine)
+        self._mines_placed = True
+        log_layout(self.rows, self.cols, lambda r, c: "M" if self.mine[r, c] else str(self.number[r, c]))
+
+    def first_click_place(self, fr: int, fc: int) -> None:
+        if self._mines_placed: return
+        if self.generator is not None:
+            self._place_mines(positions=self.generator(self.rows, self.cols, self.mines, self.rng, fr * self.cols + fc))
+            return
+        if not self.safe_first_click:
+            self._place_mines()
+            return
+        self._place_mines({(fr, fc)})
+
+    def reveal(self, r: int, c: int) -> str:
+        return self.reveal_many(((r, c),))
+
+    @instrument.probe(size=lambda board, _result: len(board.last_opened))
+    def reveal_many(self, cells: Iterable[Tuple[int,int]]) -> str:
+        opened = self.last_opened = []
+        cells = list(cells)
+        if not cells:
+            return "ok"
+        flat = np.unique(np.array([r * self.cols + c for r, c in cells]))
+        fr, fc = flat // self.cols, flat % self.cols
+        fresh = ~self.revealed[fr, fc] & ~self.flagged[fr, fc]
+        fr, fc = fr[fresh], fc[fresh]
+        self.revealed[fr, fc] = True
+        seeds = list(zip(fr.tolist(), fc.tolist()))
+        self._changed.update(seeds); opened.extend(seeds)
+        mine = self.mine[fr, fc]
+        self.revealed_safe += int(np.count_nonzero(~mine))
+        fr, fc = fr[~mine], fc[~mine]
+        keep = self.number[fr, fc] == 0
+        fr, fc = fr[keep], fc[keep]
+        if fr.size:
+            # Breadth-first flood fill from all zero seeds at once, one vectorized step per ring.
+            zero = (self.number == 0) & ~self.mine
+            while fr.size:
+                nr = (fr[:, None] + _DR).ravel()
+                nc = (fc[:, None] + _DC).ravel()
+                ok = (nr >= 0) & (nr < self.rows) & (nc >= 0) & (nc < self.cols)
+                nr, nc = nr[ok], nc[ok]
+                fresh = ~self.revealed[nr, nc] & ~self.flagged[nr, nc]
+                flat = np.unique(nr[fresh] * self.cols + nc[fresh])
+                nr, nc = flat // self.cols, flat % self.cols
+                self.revealed[nr, nc] = True
+                self.revealed_safe += int(flat.size)
+                ring = list(zip(nr.tolist(), nc.tolist()))
+                self._changed.update(ring); opened.extend(ring)
+                keep = zero[nr, nc]
+                fr, fc = nr[keep], nc[keep]
+        if self.check_invariants: self.verify_counters()
+        return "mine" if mine.any() else "ok"
+
+    def chord(self, r: int, c: int) -> str:
+        self.last_opened = []
+        if not self.revealed[r, c] or self.mine[r, c] or self.number[r, c] == 0:
+            return "ok"
+        around = list(self.neighbors(r, c))
+        if sum(bool(self.flagged[nr, nc]) for nr, nc in around) != self.number[r, c]:
+            return "ok"
+        return self.reveal_many(around)
+
+    def toggle_flag(self, r: int, c: int) -> None:
+        if self.revealed[r, c]: return
+        self.flagged[r, c] = not self.flagged[r, c]
+        self.flags += 1 if self.flagged[r, c] else -1
+        self._changed.add((r, c))
+        if self.check_invariants: self.verify_counters()
+
+    def unreveal(self, cells: Iterable[Tuple[int,int]]) -> None:
+        cells = list(cells)
+        if not cells: return
+        rr, cc = np.array(cells).T
+        shown = self.revealed[rr, cc]
+        rr, cc = rr[shown], cc[shown]
+        self.revealed[rr, cc] = False
+        self.revealed_safe -= int(np.count_nonzero(~self.mine[rr, cc]))
+        self._changed.update(zip(rr.tolist(), cc.tolist()))
+        if self.check_invariants: self.verify_counters()
+
+    def snapshot(self) -> BoardSnapshot:
+        return BoardSnapshot(self.revealed.tobytes(), self.flagged.tobytes(), self.revealed_safe, self.flags)
+
+    def restore(self, snap: BoardSnapshot) -> None:
+        shape = (self.rows, self.cols)
+        revealed = np.frombuffer(snap.revealed, dtype=bool).reshape(shape)
+        flagged = np.frombuffer(snap.flagged, dtype=bool).reshape(shape)
+        rr, cc = np.nonzero((revealed != self.revealed) | (flagged != self.flagged))
+        self._changed.update(zip(rr.tolist(), cc.tolist()))
+        self.revealed[:] = revealed
+        self.flagged[:] = flagged
+        self.revealed_safe, self.flags = snap.revealed_safe, snap.flags
+
+    def pop_changes(self) -> Set[Tuple[int,int]]:
+        changed, self._changed = self._changed, set()
+        return changed
+
+    def count_revealed(self) -> int:
+        return int(np.count_nonzero(self.revealed))
+
+    def count_non_mines(self) -> int:
+        return self.rows * self.cols - self.mines
+
+    @instrument.probe()
+    def is_cleared(self) -> bool:
+        return self.revealed_safe == self.count_non_mines()
+
+    def mines_left(self) -> int:
+        return max(0, self.mines - self.flags)
+
+    def verify_counters(self) -> None:
+        safe = int(np.count_nonzero(self.revealed & ~self.mine))
+        flags = int(np.count_nonzero(self.flagged))
+        if (safe, flags) != (self.revealed_safe, self.flags):
+            raise AssertionError(f"counter drift: revealed_safe={self.revealed_safe} (scan {safe}), "
+                                 f"flags={self.flags} (scan {flags})")
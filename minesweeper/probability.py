@@ -0,0 +1,208 @@
+"""
+probability.py — exact mine probability for every unrevealed cell.
+
+Like the solver this only uses what the player can see. The steps:
+
+1. Build the solver's Frontier and run its deductions, so cells that are
+   certainly safe or mines are settled (probability 0 or 1) before any counting.
+2. Split the remaining constraints into independent components: cells that
+   share a constraint, transitively.
+3. Count each component's solutions by mine total. Cells are visited along the
+   frontier, and the state is the remaining need of the constraints that are
+   half-assigned at that point. Counts are memoized per (position, state), so
+   the cost grows with the frontier's width, not with 2**cells.
+4. Combine the components with the interior, i.e. unknown cells next to no
+   number. With F frontier mines the interior holds the other M - F mines
+   anywhere, so each component total F is weighted by C(interior, M - F).
+
+All counts are Python ints and only the final division is a float, so the
+result is exact up to float rounding. `mine_probabilities(board)` returns
+{(r, c): p} for every unrevealed cell; `safest_cell(board)` is the best
+guess when the solver finds no certain move.
+"""
+
+from __future__ import annotations
+from collections import deque
+from math import comb
+from typing import Dict, List, Sequence, Tuple
+
+from solver import UNKNOWN, SAFE, MINE, frontier_from_board
+
+
+def _components(cons) -> List[Tuple[List[int], List[Tuple[List[int], int]]]]:
+    """Group constraints that share cells; returns [(cells, [(con cells, need), ...]), ...]."""
+    by_cell = {}
+    cons = {k: con for k, con in cons.items() if con[0]}
+    for k, (cells, _need) in cons.items():
+        for j in cells:
+            by_cell.setdefault(j, []).append(k)
+    out, done = [], set()
+    for k0 in cons:
+        if k0 in done: continue
+        done.add(k0)
+        keys, stack, cells = [], [k0], set()
+        while stack:
+            k = stack.pop()
+            keys.append(k)
+            for j in cons[k][0]:
+                if j in cells: continue
+                cells.add(j)
+                for k2 in by_cell[j]:
+                    if k2 not in done:
+                        done.add(k2); stack.append(k2)
+        out.append((_order(cells, by_cell, cons), [(sorted(cons[k][0]), cons[k][1]) for k in keys]))
+    return out
+
+
+def _order(cells, by_cell, cons) -> List[int]:
+    """Visit cells along the component (BFS from one far end) to keep the open-constraint state narrow."""
+    def bfs(start):
+        seen, queue, order = {start}, deque([start]), []
+        while queue:
+            j = queue.popleft()
+            order.append(j)
+            for k in by_cell[j]:
+                for j2 in sorted(cons[k][0]):
+                    if j2 not in seen:
+                        seen.add(j2); queue.append(j2)
+        return order
+    return bfs(bfs(min(cells))[-1])
+
+
+def _add(acc: List[int], poly: Sequence[int], shift: int = 0) -> List[int]:
+    """acc += poly * x**shift (polynomials as coefficient lists by mine count)."""
+    need = len(poly) + shift
+    if len(acc) < need: acc.extend([0] * (need - len(acc)))
+    for m, v in enumerate(poly):
+        if v: acc[m + shift] += v
+    return acc
+
+
+def _mul(a: Sequence[int], b: Sequence[int]) -> List[int]:
+    out = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                out[i + j] += x * y
+    return out
+
+
+def count_component(cells: List[int], constraints: List[Tuple[List[int], int]]):
+    """
+    Count the mine assignments of one component that satisfy every constraint.
+
+    Returns (total, per_cell): total[m] is the number of solutions with m mines
+    and per_cell[j][m] the number of those in which cell j is a mine.
+    """
+    n = len(cells)
+    pos = {j: i for i, j in enumerate(cells)}
+    cons_at = [[] for _ in range(n)]           # constraint indices touching each position
+    first, last = [], []
+    for ci, (cc, _need) in enumerate(constraints):
+        ps = sorted(pos[j] for j in cc)
+        first.append(ps[0]); last.append(ps[-1])
+        for p in ps: cons_at[p].append(ci)
+    # open[i]: constraints with cells both before and at/after position i (the memo state)
+    open_at = [[ci for ci in range(len(constraints)) if first[ci] < i <= last[ci]] for i in range(n + 1)]
+    # cells of each constraint strictly after position i, for pruning
+    left_after = [dict() for _ in range(n)]
+    for ci, (cc, _need) in enumerate(constraints):
+        ps = sorted(pos[j] for j in cc)
+        for k, p in enumerate(ps):
+            left_after[p][ci] = len(ps) - k - 1
+
+    def step(i, state, v):
+        """Assign v to position i from `state` (needs aligned with open_at[i]); next state or None."""
+        need = dict(zip(open_at[i], state))
+        for ci in cons_at[i]:
+            rem = need.get(ci, constraints[ci][1]) - v
+            if rem < 0 or rem > left_after[i][ci]: return None
+            need[ci] = rem
+        return tuple(need[ci] if ci in need else constraints[ci][1] for ci in open_at[i + 1])
+
+    # forward: ways[i][state] = poly of partial assignments of positions < i
+    ways = [dict() for _ in range(n + 1)]
+    ways[0][()] = [1]
+    for i in range(n):
+        nxt = ways[i + 1]
+        for state, poly in ways[i].items():
+            for v in (0, 1):
+                s2 = step(i, state, v)
+                if s2 is not None:
+                    nxt[s2] = _add(nxt.get(s2, []), poly, v)
+
+    # backward with memoization: rest(i, state) = poly of completions of positions >= i
+    memo = {}
+    def rest(i, state):
+        if i == n: return [1]
+        key = (i, state)
+        got = memo.get(key)
+        if got is None:
+            got = []
+            for v in (0, 1):
+                s2 = step(i, state, v)
+                if s2 is not None: _add(got, rest(i + 1, s2), v)
+            memo[key] = got
+        return got
+
+    per_cell = {}
+    for i, j in enumerate(cells):
+        acc = []
+        for state, poly in ways[i].items():
+            s2 = step(i, state, 1)
+            if s2 is not None: _add(acc, _mul(poly, rest(i + 1, s2)), 1)
+        per_cell[j] = acc
+    total = ways[n].get((), [])
+    return total, per_cell
+
+
+def mine_probabilities(board) -> Dict[Tuple[int, int], float]:
+    """Exact mine probability of every unrevealed cell of a Board/NumpyBoard (flags are ignored)."""
+    f = frontier_from_board(board)
+    f.deduce()
+    cols, state = board.cols, f.state
+    probs = {}
+    for i, st in enumerate(state):
+        if st == SAFE: probs[divmod(i, cols)] = 0.0
+        elif st == MINE: probs[divmod(i, cols)] = 1.0
+
+    comps = [count_component(cells, constraints) for cells, constraints in _components(f.cons)]
+    frontier = set(f.watch)
+    interior = [i for i, st in enumerate(state) if st == UNKNOWN and i not in frontier]
+    mines_left, n_int = f.mines_left, len(interior)
+
+    # prefix/suffix products let each component see the others' combined mine counts
+    totals = [t for t, _ in comps]
+    prefix = [[1]]
+    for t in totals: prefix.append(_mul(prefix[-1], t))
+    suffix = [[1]]
+    for t in reversed(totals): suffix.append(_mul(suffix[-1], t))
+    suffix.reverse()
+    weight = [comb(n_int, mines_left - m) if 0 <= mines_left - m <= n_int else 0
+              for m in range(len(prefix[-1]))]
+    z = sum(w * c for w, c in zip(weight, prefix[-1]))
+    if z == 0:
+        raise ValueError("no mine layout fits the revealed numbers")
+
+    for ci, (_total, per_cell) in enumerate(comps):
+        others = _mul(prefix[ci], suffix[ci + 1])
+        # g[m] = weight of this component holding m mines, summed over the others
+        g = [sum(o * weight[m + t] for t, o in enumerate(others) if m + t < len(weight))
+             for m in range(len(totals[ci]))]
+        for j, poly in per_cell.items():
+            probs[divmod(j, cols)] = sum(c * g[m] for m, c in enumerate(poly)) / z
+
+    if n_int:
+        # each interior cell is a mine in (mines_left - F) / n_int of the layouts with F frontier mines
+        hit = sum(w * c * (mines_left - m) for m, (w, c) in enumerate(zip(weight, prefix[-1])))
+        p = hit / (z * n_int)
+        for i in interior:
+            probs[divmod(i, cols)] = p
+    return probs
+
+
+def safest_cell(board) -> Tuple[Tuple[int, int], float] | None:
+    """The unrevealed, unflagged cell least likely to be a mine, with that probability."""
+    probs = mine_probabilities(board)
+    best = min(((p, rc) for rc, p in probs.items() if not board.grid[rc[0]][rc[1]].flagged), default=None)
+    return (best[1], best[0]) if best else None
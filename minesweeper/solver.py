@@ -0,0 +1,241 @@
+"""
+solver.py — deterministic Minesweeper deduction without guessing.
+
+The solver only looks at what a player can see: revealed numbers (flags are
+ignored, they may be wrong). It keeps the frontier as one constraint per
+revealed number — the set of still-unknown neighbours and how many of them
+are mines — plus, for every unknown cell, the constraints that mention it, so
+each deduction only revisits the constraints it touches. Rules, in order:
+
+- zero: every unknown neighbour of a revealed 0 is safe (the flood fill
+  normally opens them, but a wrong flag can stop it)
+- single cell: a constraint needing 0 mines makes all its cells safe; one
+  needing as many mines as it has cells makes them all mines
+- pairs: for two overlapping constraints A and B, if A needs exactly
+  |A \\ B| more mines than B then A \\ B are all mines and B \\ A all safe
+  (this includes the classic subset rule)
+- global count: once every mine is known the rest is safe, and if the
+  unknown cells are exactly the remaining mines they are all mines
+
+`deduce(board)` and `hint(board)` work on a live `Board`/`NumpyBoard`;
+`play_layout`/`solve_layout` play a whole layout from a first click, which
+is what analytics and no-guess generation use.
+"""
+
+from __future__ import annotations
+from typing import List, Sequence, Set, Tuple
+
+from board import neighbor_table
+
+UNKNOWN, REVEALED, SAFE, MINE = 0, 1, 2, 3
+
+
+class Frontier:
+    """Visible-state constraint set for one board, updated incrementally."""
+
+    def __init__(self, rows: int, cols: int, mines: int | None = None):
+        self.rows, self.cols = rows, cols
+        self.nbrs = neighbor_table(rows, cols)
+        self.state = bytearray(rows * cols)    # UNKNOWN / REVEALED / SAFE / MINE per flat cell
+        self.cons = {}                         # revealed cell -> [set of unknown neighbours, mines needed]
+        self.watch = {}                        # unknown cell -> set of revealed cells constraining it
+        self.dirty = set()                     # constraints to re-check with the single-cell rule
+        self.touched = set()                   # constraints changed since the last pair pass
+        self.unknown = rows * cols             # cells still UNKNOWN
+        self.mines_left = mines                # total mines minus known mines (None: not used)
+        self.found = []                        # cells marked safe by reveal(), reported by the next deduce()
+
+    # --- state changes -------------------------------------------------------------------------
+
+    def _release(self, i: int, is_mine: bool) -> None:
+        # i leaves the unknown set: drop it from every constraint that mentions it
+        for k in self.watch.pop(i, ()):
+            con = self.cons[k]
+            con[0].discard(i)
+            if is_mine: con[1] -= 1
+            self.dirty.add(k)
+            self.touched.add(k)
+
+    def reveal(self, i: int, number: int, filled: bool = False) -> None:
+        """
+        Record that flat cell i is revealed showing `number`. `filled` says the
+        caller opens every neighbour of a 0 itself, as play_layout's fill does.
+        """
+        state = self.state
+        st = state[i]
+        if st == REVEALED: return
+        if st == UNKNOWN:
+            self.unknown -= 1
+            if i in self.watch: self._release(i, False)
+        state[i] = REVEALED
+        if number == 0:
+            if filled: return
+            # Every neighbour is safe. The flood fill usually opens them, but a
+            # (possibly wrong) flag stops it, so mark the rest safe explicitly.
+            for j in self.nbrs[i]:
+                if state[j] == UNKNOWN:
+                    state[j] = SAFE
+                    self.unknown -= 1
+                    if j in self.watch: self._release(j, False)
+                    self.found.append(j)
+            return
+        cells, need, watch = set(), number, self.watch
+        for j in self.nbrs[i]:
+            sj = state[j]
+            if sj == UNKNOWN:
+                cells.add(j)
+                w = watch.get(j)
+                if w is None: watch[j] = {i}
+                else: w.add(i)
+            elif sj == MINE:
+                need -= 1
+        if cells:
+            self.cons[i] = [cells, need]
+            self.dirty.add(i)
+            self.touched.add(i)
+
+    def mark_safe(self, i: int) -> None:
+        if self.state[i] != UNKNOWN: return
+        self.state[i] = SAFE
+        self.unknown -= 1
+        self._release(i, False)
+
+    def mark_mine(self, i: int) -> None:
+        if self.state[i] != UNKNOWN: return
+        self.state[i] = MINE
+        self.unknown -= 1
+        if self.mines_left is not None: self.mines_left -= 1
+        self._release(i, True)
+
+    # --- deduction -----------------------------------------------------------------------------
+
+    def deduce(self) -> Tuple[List[int], List[int]]:
+        """Run all rules to a fixpoint; returns the newly found (safe, mines) flat indices."""
+        safe = [j for j in self.found if self.state[j] == SAFE]  # not revealed since
+        mines = []
+        self.found = []
+        while True:
+            self._single(safe, mines)
+            if self._pairs(safe, mines): continue
+            if self._global(safe, mines): continue
+            return safe, mines
+
+    def _single(self, safe: List[int], mines: List[int]) -> None:
+        cons, dirty = self.cons, self.dirty
+        while dirty:
+            k = dirty.pop()
+            con = cons.get(k)
+            if con is None: continue
+            cells, need = con
+            if not cells:
+                del cons[k]
+            elif need == 0:
+                for j in list(cells):
+                    self.mark_safe(j); safe.append(j)
+            elif need == len(cells):
+                for j in list(cells):
+                    self.mark_mine(j); mines.append(j)
+
+    def _pairs(self, safe: List[int], mines: List[int]) -> bool:
+        # A pair can only yield something new if one side changed since the last pass.
+        new_safe, new_mines = set(), set()
+        cons, watch = self.cons, self.watch
+        touched, self.touched = self.touched, set()
+        seen = set()
+        for ka in touched:
+            con = cons.get(ka)
+            if con is None: continue
+            a, need_a = con
+            others = set()
+            for j in a:
+                others |= watch[j]
+            for kb in others:
+                if kb == ka or (kb, ka) in seen: continue
+                seen.add((ka, kb))
+                b, need_b = cons[kb]
+                only_a, only_b = a - b, b - a
+                if need_a - need_b == len(only_a):
+                    new_mines |= only_a; new_safe |= only_b
+                elif need_b - need_a == len(only_b):
+                    new_mines |= only_b; new_safe |= only_a
+        for j in new_mines:
+            self.mark_mine(j); mines.append(j)
+        for j in new_safe:
+            self.mark_safe(j); safe.append(j)
+        return bool(new_mines or new_safe)
+
+    def _global(self, safe: List[int], mines: List[int]) -> bool:
+        if self.mines_left is None or self.unknown == 0: return False
+        if self.mines_left == 0:
+            out, mark = safe, self.mark_safe
+        elif self.mines_left == self.unknown:
+            out, mark = mines, self.mark_mine
+        else:
+            return False
+        for j in [j for j, st in enumerate(self.state) if st == UNKNOWN]:
+            mark(j); out.append(j)
+        return True
+
+
+def frontier_from_board(board) -> Frontier:
+    """Build a Frontier from a Board/NumpyBoard's revealed, non-mine cells."""
+    f = Frontier(board.rows, board.cols, board.mines)
+    if hasattr(board, "revealed"):  # NumpyBoard: read the arrays directly
+        shown = (board.revealed & ~board.mine).ravel().nonzero()[0].tolist()
+        numbers = board.number.ravel().tolist()
+        for i in shown:
+            f.reveal(i, numbers[i])
+    else:
+        cols = board.cols
+        for r, row in enumerate(board.grid):
+            for c, cell in enumerate(row):
+                if cell.revealed and not cell.mine:
+                    f.reveal(r * cols + c, cell.number)
+    return f
+
+
+def deduce(board) -> Tuple[Set[Tuple[int,int]], Set[Tuple[int,int]]]:
+    """(safe, mines): unrevealed cells that are certainly safe / certainly mines on this board."""
+    f = frontier_from_board(board)
+    safe, mines = f.deduce()
+    cols = board.cols
+    return {divmod(i, cols) for i in safe}, {divmod(i, cols) for i in mines}
+
+
+def hint(board) -> Tuple[int,int] | None:
+    """One certainly-safe unrevealed, unflagged cell, or None if every move is a guess."""
+    safe, _ = deduce(board)
+    safe = sorted(rc for rc in safe if not board.grid[rc[0]][rc[1]].flagged)
+    return safe[0] if safe else None
+
+
+def play_layout(numbers: Sequence[int], rows: int, cols: int, mines: int, start: int) -> Frontier:
+    """
+    Play a layout from flat cell `start` using only deductions, until stuck or done.
+
+    `numbers` is the flat layout (-1 for mines, else 0–8). Returns the final
+    Frontier: REVEALED cells are the ones opened, and `watch` holds the
+    still-unknown cells next to a number (where a guess would be needed).
+    """
+    f = Frontier(rows, cols, mines)
+    nbrs, state = f.nbrs, f.state
+    todo = [start]
+    while todo:
+        # reveal (with flood fill through zeros), then deduce the next safe cells
+        while todo:
+            i = todo.pop()
+            if state[i] == REVEALED: continue
+            n = numbers[i]
+            f.reveal(i, n, filled=True)
+            if n == 0:
+                todo.extend(j for j in nbrs[i] if state[j] != REVEALED)
+        todo, _ = f.deduce()
+    return f
+
+
+def solve_layout(numbers: Sequence[int], rows: int, cols: int, mines: int, start: int) -> int:
+    """
+    How many safe cells `play_layout` opens from `start`; the board is solvable
+    without guessing iff that equals rows * cols - mines.
+    """
+    return play_layout(numbers, rows, cols, mines, start).state.count(REVEALED)
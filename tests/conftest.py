@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The game modules import each other by bare name and are run from minesweeper/.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "minesweeper"))
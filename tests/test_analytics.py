@@ -0,0 +1,46 @@
+"""gen_boards_array must draw from the same distribution as the MinesweeperGame path (gen_boards)."""
+
+import numpy as np
+import pytest
+
+import analytics
+
+ROWS, COLS, MINES, N = 9, 9, 10, 20_000
+
+
+@pytest.fixture(scope="module")
+def both():
+    slow = np.asarray(analytics.gen_boards(ROWS, COLS, MINES, N, seed=1))
+    fast = analytics.gen_boards_array(ROWS, COLS, MINES, N, seed=2)
+    return slow, fast
+
+
+def test_shapes_and_mine_counts(both):
+    slow, fast = both
+    assert slow.shape == fast.shape == (N, ROWS, COLS)
+    assert ((slow == analytics.MINE).sum(axis=(1, 2)) == MINES).all()
+    assert ((fast == analytics.MINE).sum(axis=(1, 2)) == MINES).all()
+
+
+def test_per_cell_mine_frequency(both):
+    slow, fast = both
+    p = MINES / (ROWS * COLS)                # every cell, first click included over random clicks
+    sd = np.sqrt(2 * p * (1 - p) / N)         # of the difference of two frequencies
+    freq_slow = (slow == analytics.MINE).mean(axis=0)
+    freq_fast = (fast == analytics.MINE).mean(axis=0)
+    assert np.abs(freq_slow - freq_fast).max() < 5 * sd
+    assert np.abs(freq_fast - p).max() < 5 * np.sqrt(p * (1 - p) / N)
+
+
+def test_number_histograms(both):
+    slow, fast = both
+    hist = lambda b: np.bincount((b.astype(np.int64) - analytics.MINE).ravel(), minlength=10) / b.size
+    h_slow, h_fast = hist(slow), hist(fast)
+    sd = np.sqrt(2 * h_slow * (1 - h_slow) / slow.size) + 1e-9
+    assert (np.abs(h_slow - h_fast) < 5 * sd + 1e-4).all()
+
+
+def test_seeded_output_is_reproducible():
+    a = analytics.gen_boards_array(ROWS, COLS, MINES, 50, seed=7)
+    b = analytics.gen_boards_array(ROWS, COLS, MINES, 50, seed=7)
+    assert (a == b).all()
@@ -0,0 +1,83 @@
+"""ChunkedBoard: exact mine totals however sparse the board, and per-chunk move deltas."""
+
+import random
+
+import pytest
+
+from board import make_board
+from chunkboard import ChunkCells
+from game import Game, MinesweeperGame
+
+
+@pytest.mark.parametrize("rows, cols, mines", [
+    (300, 300, 10), (300, 300, 30), (9, 9, 10), (16, 30, 99), (65, 65, 100), (130, 100, 12000), (1000, 1000, 7),
+])
+def test_exact_mine_total(rows, cols, mines):
+    for seed in range(3):
+        board = make_board(rows, cols, mines, engine="chunked", rng=seed)
+        assert board.mines == mines
+        board.first_click_place(rows // 2, cols // 2)
+        placed = sum(len(board._mines_of(cy, cx)[1]) for cy in range(board._ny) for cx in range(board._nx))
+        assert placed == mines
+        assert not board.is_mine(rows // 2, cols // 2)
+
+
+def test_too_dense():
+    with pytest.raises(ValueError):
+        make_board(65, 65, 65 * 65 - 2, engine="chunked")
+
+
+def test_minesweeper_game_reads_a_chunked_board():
+    g = MinesweeperGame(70, 90, 600, engine="chunked", rng=4)
+    g.reveal(10, 10)
+    layout = g.board
+    assert len(layout) == 70 and all(len(row) == 90 for row in layout)
+    assert sum(row.count(MinesweeperGame.MINE) for row in layout) == 600
+    assert layout[10][10] != MinesweeperGame.MINE
+
+
+def test_chunk_cells_is_a_set_of_cells():
+    cells = ChunkCells(8)
+    wanted = {(0, 0), (7, 7), (8, 0), (20, 33), (7, 7)}
+    for rc in wanted:
+        cells.add(rc)
+    assert len(cells) == len(wanted) and cells == wanted and set(cells) == wanted
+    assert (20, 33) in cells and (20, 34) not in cells and (99, 99) not in cells
+    assert cells & {(0, 0), (1, 1)} == {(0, 0)}
+
+
+def test_large_opening_is_kept_per_chunk_and_undoes():
+    # Sparse board: the first click opens most of it, the case that used to cost a tuple per cell.
+    game = Game(make_board(300, 300, 30, engine="chunked", rng=2))
+    board = game.board
+    game.click(150, 150)
+    opened = board.last_opened
+    assert isinstance(opened, ChunkCells) and game.history[-1].opened is opened
+    assert len(opened) == board.revealed_safe > 80_000
+    assert len(opened._bits) == board.chunks_in_memory()["state"]
+    assert len(board.pop_changes()) == len(opened)
+    game.undo()
+    assert board.revealed_safe == 0 and board.pop_changes() == opened
+    game.redo()
+    assert board.revealed_safe == len(opened)
+
+
+def test_undo_and_redo_match_the_list_engine():
+    chunked = Game(make_board(60, 70, 300, engine="chunked", rng=6, check_invariants=True))
+    chunked.click(30, 30)
+    b = chunked.board
+    positions = [r * 70 + c for r in range(60) for c in range(70) if b.is_mine(r, c)]
+    plain = Game(make_board(60, 70, 300, generator=lambda *_: positions, check_invariants=True))
+    plain.click(30, 30)
+    assert set(b.last_opened) == set(plain.board.last_opened)
+    rng = random.Random(6)
+    for _ in range(200):
+        r, c, kind = rng.randrange(60), rng.randrange(70), rng.random()
+        for game in (chunked, plain):
+            if game.won or game.lost or kind < 0.3: game.undo()
+            elif kind < 0.45: game.redo()
+            elif kind < 0.6: game.flag(r, c)
+            else: game.click(r, c)
+        assert chunked.board.pop_changes() == plain.board.pop_changes()
+        assert (chunked.won, chunked.lost, b.revealed_safe, b.flags) == \
+               (plain.won, plain.lost, plain.board.revealed_safe, plain.board.flags)
@@ -0,0 +1,86 @@
+"""NumpyBoard must play exactly like Board: same layouts, same visible state after every move."""
+
+import random
+
+import pytest
+
+from board import make_board
+from game import Game
+
+
+def visible(game):
+    board = game.board
+    return ([[(cell.revealed, cell.flagged) for cell in row] for row in board.grid],
+            board.revealed_safe, board.flags, board.mines_left(), game.won, game.lost)
+
+
+def play_both(rows, cols, mines, seed, moves):
+    """Play the same seeded random move sequence on both engines, comparing after every move."""
+    games = [Game(make_board(rows, cols, mines, engine=engine, rng=seed, check_invariants=True))
+             for engine in ("list", "numpy")]
+    rng = random.Random(seed)
+    for _ in range(moves):
+        if games[0].won or games[0].lost: break
+        r, c = rng.randrange(rows), rng.randrange(cols)
+        kind = rng.random()
+        results = []
+        for g in games:
+            if kind < 0.2: results.append(g.flag(r, c))
+            elif kind < 0.35: results.append(g.chord(r, c))
+            else: results.append(g.click(r, c))
+        assert results[0] == results[1]
+        assert sorted(games[0].board.last_opened) == sorted(games[1].board.last_opened)
+        assert games[0].board.pop_changes() == games[1].board.pop_changes()
+        assert visible(games[0]) == visible(games[1])
+    return games
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_same_layout_and_moves(seed):
+    rows, cols = 5 + seed % 12, 5 + seed * 7 % 25
+    mines = max(1, rows * cols * (10 + seed % 15) // 100)
+    list_game, numpy_game = play_both(rows, cols, mines, seed, 150)
+    layout = lambda g: [[(cell.mine, cell.number) for cell in row] for row in g.board.grid]
+    assert layout(list_game) == layout(numpy_game)
+
+
+def test_flood_fill_stops_at_flags():
+    for seed in range(20):
+        games = [Game(make_board(20, 20, 30, engine=engine, rng=seed)) for engine in ("list", "numpy")]
+        for g in games:
+            g.flag(10, 10); g.flag(3, 15); g.click(0, 0)
+        assert visible(games[0]) == visible(games[1])
+
+
+def test_win_and_loss_match():
+    outcomes = set()
+    for seed in range(60):
+        list_game, numpy_game = play_both(6, 6, 4, seed, 400)
+        assert (list_game.won, list_game.lost) == (numpy_game.won, numpy_game.lost)
+        outcomes.add((list_game.won, list_game.lost))
+    assert {(True, False), (False, True)} <= outcomes  # both endings were exercised
+
+
+@pytest.mark.parametrize("wrong_flag", [False, True])
+def test_chord_matches(wrong_flag):
+    chorded = 0
+    for seed in range(30):
+        games = [Game(make_board(12, 12, 25, engine=engine, rng=seed)) for engine in ("list", "numpy")]
+        for g in games: g.click(6, 6)
+        board = games[0].board
+        target = next(((r, c) for r in range(12) for c in range(12)
+                       if board.grid[r][c].revealed and board.grid[r][c].number > 0), None)
+        if target is None: continue
+        around = board.neighbors(*target)
+        flags = [rc for rc in around if board.grid[rc[0]][rc[1]].mine]
+        covered_safe = [rc for rc in around if not board.grid[rc[0]][rc[1]].mine and not board.grid[rc[0]][rc[1]].revealed]
+        if wrong_flag:
+            if not covered_safe: continue
+            flags = flags[1:] + covered_safe[:1]   # right count, one on a safe cell: the chord hits a mine
+        for g in games:
+            for rc in flags: g.flag(*rc)
+            g.chord(*target)
+        assert visible(games[0]) == visible(games[1])
+        assert games[0].lost == wrong_flag
+        chorded += 1
+    assert chorded >= 10
@@ -0,0 +1,44 @@
+"""SqliteStore ranks and percentiles agree with the sorted JsonStore."""
+
+import random
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+import highscores
+
+KEY = "9x9:10"
+
+
+def filled(tmp_path, times):
+    json_store = highscores.JsonStore(str(tmp_path / "scores.json"))
+    sql_store = highscores.SqliteStore(str(tmp_path / "scores.sqlite3"), legacy_json=None)
+    for i, t in enumerate(times):
+        entry = {"name": f"p{i}", "time": t, "when": ""}
+        assert json_store.submit(KEY, entry) == sql_store.submit(KEY, entry)
+    return json_store, sql_store
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_rank_and_time_at_match(tmp_path, seed):
+    rng = random.Random(seed)
+    # whole-second ties and bucket edges as well as spread-out times
+    times = [rng.choice([rng.uniform(1, 60), float(rng.randint(1, 60)), rng.uniform(10, 11)]) for _ in range(150)]
+    json_store, sql_store = filled(tmp_path, times)
+    for probe in times + [0.5, 10.0, 11.0, 61.0, float("inf")]:
+        assert sql_store.rank(KEY, probe) == json_store.rank(KEY, probe)
+    for index in range(-1, len(times) + 2):
+        assert sql_store.time_at(KEY, index) == json_store.time_at(KEY, index)
+
+
+def test_buckets_rebuilt_for_older_databases(tmp_path):
+    rng = random.Random(5)
+    times = [rng.uniform(1, 30) for _ in range(50)]
+    json_store, sql_store = filled(tmp_path, times)
+    with closing(sqlite3.connect(sql_store.path)) as conn, conn:
+        conn.execute("DROP TABLE buckets")
+    sql_store = highscores.SqliteStore(sql_store.path, legacy_json=None)
+    for probe in times:
+        assert sql_store.rank(KEY, probe) == json_store.rank(KEY, probe)
+    assert sql_store.time_at(KEY, 25) == json_store.time_at(KEY, 25)
@@ -0,0 +1,91 @@
+"""Move logs: seeds round-trip, and damaged files are rejected with ValueError."""
+
+import random
+
+import pytest
+
+import movelog
+from board import make_board
+from game import Game
+
+
+def played(seed=7, rows=9, cols=9, mines=10):
+    game = Game(make_board(rows, cols, mines, rng=seed))
+    game.flag(4, 4)
+    game.click(0, 0)
+    game.click(8, 8)
+    return game
+
+
+@pytest.mark.parametrize("seed", [0, 1, -1, 2**63, 2**64, 3**50])
+def test_any_seed_can_be_logged(seed):
+    game = played(seed)
+    log = movelog.read(bytes(game.log.data))
+    assert log.seed == game.seed
+    assert movelog.replay(bytes(game.log.data)).game.board.grid[0][0].revealed == game.board.grid[0][0].revealed
+
+
+def test_no_seed_is_not_seed_zero():
+    game = Game(make_board(9, 9, 10, rng=random.Random(3)))
+    assert game.seed is None
+    assert movelog.read(bytes(game.log.data)).seed is None
+    assert movelog.read(bytes(played(0).log.data)).seed == 0
+
+
+def test_truncated_layout():
+    data = bytes(played().log.data)
+    flag_end = movelog._HEADER.size + movelog._RECORD.size
+    layout_end = flag_end + movelog._RECORD.size + (81 + 7) // 8   # layout record and bitmap
+    for cut in range(flag_end + 1, layout_end):
+        with pytest.raises(ValueError):
+            movelog.read(data[:cut])
+
+
+def test_bad_header_dimensions():
+    data = bytearray(played().log.data)
+    for rows, cols, mines in ((0, 9, 10), (9, 0, 10), (9, 9, 0), (9, 9, 81)):
+        data[:movelog._HEADER.size] = movelog._HEADER.pack(movelog.MAGIC, movelog.VERSION, rows, cols, mines, 7, True)
+        with pytest.raises(ValueError):
+            movelog.read(bytes(data))
+
+
+def test_corrupt_logs_raise_value_error():
+    data = bytes(played().log.data)
+    rng = random.Random(0)
+    for _ in range(500):
+        bad = bytearray(data)
+        for _ in range(rng.randint(1, 4)):
+            bad[rng.randrange(len(bad))] = rng.randrange(256)
+        bad = bytes(bad[:rng.randint(0, len(bad))])
+        try:
+            log = movelog.read(bad)
+        except ValueError:
+            continue
+        movelog.replay(log)  # whatever parses must also replay
+
+
+def test_standard_log_with_chunked_engine():
+    game = played()
+    board = movelog.read(bytes(game.log.data)).make_board("chunked")
+    assert not hasattr(board, "per_chunk")
+    assert movelog.replay(bytes(game.log.data), engine="chunked").game.board.revealed_safe == game.board.revealed_safe
+
+
+def test_version_2_logs_still_read():
+    game = played()
+    log = movelog.read(bytes(game.log.data))
+    header, record, cell = movelog._FORMATS[2]
+    old = bytearray(header.pack(movelog.MAGIC, 2, log.rows, log.cols, log.mines, log.seed, True))
+    flag, *reveals = log.moves
+    old += record.pack(*flag[:4]) + record.pack(movelog.LAYOUT, 0, 0, 0) + movelog.mine_bits(game.board)
+    old += b"".join(record.pack(*move[:4]) for move in reveals)
+    assert movelog.read(bytes(old)) == log
+
+
+def test_large_chunked_board_is_logged():
+    game = Game(make_board(70000, 70000, 70000 * 70000 // 5, engine="chunked", rng=1))
+    game.click(69999, 69999)
+    game.flag(0, 0)
+    log = movelog.read(bytes(game.log.data))
+    assert (log.rows, log.cols) == (70000, 70000)
+    assert [(kind, r, c) for kind, _ms, r, c, _cells in log.moves] == [(movelog.REVEAL, 69999, 69999), (movelog.FLAG, 0, 0)]
@@ -0,0 +1,48 @@
+"""mine_probabilities against brute-force enumeration, including boards with wrong flags."""
+
+import itertools
+import random
+
+import pytest
+
+from board import make_board
+from game import Game
+from probability import mine_probabilities
+
+
+def brute_force(board):
+    """Mine probability of every unrevealed cell, by enumerating the layouts consistent with what is shown."""
+    rows, cols = board.rows, board.cols
+    shown = {(r, c): board.grid[r][c].number for r in range(rows) for c in range(cols)
+             if board.grid[r][c].revealed}
+    hidden = [(r, c) for r in range(rows) for c in range(cols) if (r, c) not in shown]
+    counts, layouts = dict.fromkeys(hidden, 0), 0
+    for mines in itertools.combinations(hidden, board.mines):
+        mines = set(mines)
+        if all(sum((rr, cc) in mines for rr in range(r - 1, r + 2) for cc in range(c - 1, c + 2)) == n
+               for (r, c), n in shown.items()):
+            layouts += 1
+            for rc in mines:
+                counts[rc] += 1
+    return {rc: k / layouts for rc, k in counts.items()}
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_matches_brute_force_with_flags(seed):
+    rng = random.Random(seed)
+    rows, cols, mines = rng.randint(3, 5), rng.randint(3, 5), rng.randint(2, 4)
+    game = Game(make_board(rows, cols, mines, rng=seed))
+    board = game.board
+    # Random flags (right or wrong) before the clicks, so some stop the flood fill.
+    for _ in range(rng.randint(1, 4)):
+        game.flag(rng.randrange(rows), rng.randrange(cols))
+    for _ in range(rng.randint(1, 3)):
+        r, c = rng.randrange(rows), rng.randrange(cols)
+        cell = board.grid[r][c]
+        if cell.flagged or cell.revealed or (cell.mine and game.started): continue
+        game.click(r, c)
+    if not board.revealed_safe or game.won or game.lost: pytest.skip("nothing left to estimate")
+    got, want = mine_probabilities(board), brute_force(board)
+    assert got.keys() == want.keys()
+    for rc, p in want.items():
+        assert got[rc] == pytest.approx(p, abs=1e-9), rc
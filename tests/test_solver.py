@@ -0,0 +1,35 @@
+"""Solver deductions when the flood fill was stopped by a wrong flag."""
+
+import pytest
+
+import solver
+from board import make_board
+
+
+def fixed(positions):
+    return lambda rows, cols, mines, rng, first: positions
+
+
+@pytest.mark.parametrize("engine", ["list", "numpy"])
+def test_zero_next_to_wrong_flag_is_safe(engine):
+    # 3x5, one mine in the far corner; a wall of wrong flags in column 2 stops the fill.
+    board = make_board(3, 5, 1, engine=engine, generator=fixed([14]))
+    for r in range(3):
+        board.toggle_flag(r, 2)
+    assert board.reveal(0, 0) == "ok"
+    assert not any(board.grid[r][c].revealed for r in range(3) for c in range(2, 5))
+    safe, mines = solver.deduce(board)
+    assert {(0, 2), (1, 2), (2, 2)} <= safe
+    assert not mines
+    # Every certain move is flagged, so there is nothing to hint yet.
+    assert solver.hint(board) is None
+
+
+def test_frontier_reports_cells_marked_safe_by_a_zero():
+    f = solver.Frontier(3, 3, 1)
+    f.reveal(0, 0)
+    safe, mines = f.deduce()
+    assert sorted(safe) == [1, 3, 4]
+    assert not mines
+    f.reveal(1, 1)   # already known safe: not reported again
+    assert f.deduce() == ([], [])